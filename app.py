@@ -1,15 +1,29 @@
 from __future__ import annotations
 
+import atexit
+import base64
 import csv
+import hashlib
+import io
+import json
+import multiprocessing
 import os
 import re
-import uuid
-from collections import defaultdict
+import signal
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
-from io import StringIO
+from functools import lru_cache
 from pathlib import Path
 from urllib.parse import parse_qs, unquote, urlparse
 
+import click
 import qrcode
 from flask import (
     Flask,
@@ -17,21 +31,42 @@ from flask import (
     abort,
     current_app,
     flash,
+    g,
+    has_app_context,
+    has_request_context,
     jsonify,
     redirect,
     render_template,
     request,
+    send_file,
+    stream_with_context,
     url_for,
 )
-from flask_migrate import Migrate
+from flask_migrate import Migrate, upgrade
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import text
+from flask_sqlalchemy.session import Session
+from PIL import Image, ImageDraw, ImageFont
+from qrcode.exceptions import DataOverflowError
+from sqlalchemy import Engine, case, event, func, insert, or_, select, text, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import validates
 
 from config import Config
 
 
 BASE_DIR = Path(__file__).resolve().parent
 WHITESPACE_RE = re.compile(r"\s+")
+BARE_BARCODE_RE = re.compile(r"[0-9A-Za-z_-]+")
+BARCODE_ID_MAX_LENGTH = 100
+QR_SIZE_PRESETS = {"thumb": 2, "screen": 6, "print": 12}
+QR_MIMETYPES = {"png": "image/png", "svg": "image/svg+xml"}
+QR_DARK_RUN_RE = re.compile(rb"\x00+")
+BARCODE_ALPHABET = "0123456789abcdefghjkmnpqrstvwxyz"
+BARCODE_DIGITS = {char: index for index, char in enumerate(BARCODE_ALPHABET)}
+BARCODE_BODY_LENGTH = 8
+BARCODE_SHIFTS = tuple(range(5 * (BARCODE_BODY_LENGTH - 1), -1, -5))
+BARCODE_CHECK_POLYNOMIAL = 0b100101
+PNG_SUFFIX_RE = re.compile(r"\.png", re.IGNORECASE)
 BARCODE_PRESETS = {
     "recent": "Zuletzt hinzugefügt",
     "last7": "Letzte 7 Tage",
@@ -40,32 +75,274 @@ BARCODE_PRESETS = {
     "all": "Alle Artikel",
 }
 
-db = SQLAlchemy()
+INDEX_STATUS_OPTIONS = {
+    "alle": "Alle",
+    "kritisch": "Nur kritisch",
+    "knapp": "Nur knapp",
+    "ausreichend": "Nur ausreichend",
+}
+INDEX_SORT_OPTIONS = {
+    "name": "Name A–Z",
+    "name_desc": "Name Z–A",
+    "bestand": "Bestand aufsteigend",
+    "bestand_desc": "Bestand absteigend",
+    "neu": "Neueste zuerst",
+}
+REORDER_GROUP_OPTIONS = {
+    "lieferant": "Lieferant",
+    "lagerplatz": "Lagerplatz",
+}
+REORDER_CSV_COLUMNS = (
+    "lieferant",
+    "lagerplatz",
+    "name",
+    "barcode_id",
+    "bestand",
+    "mindestbestand",
+    "fehlmenge",
+    "bestelllink",
+)
+SEARCH_TEXT_SQL = "lower(name || ' ' || coalesce(lagerplatz, '') || ' ' || barcode_id)"
+SEARCH_CANDIDATE_LIMIT = 200
+SEARCH_MAX_TERMS = 8
+SEARCH_MIN_SIMILARITY = 0.3
+API_ARTICLE_FIELDS = (
+    "id",
+    "name",
+    "bestand",
+    "mindestbestand",
+    "lagerplatz",
+    "barcode_id",
+    "status",
+    "bestelllink",
+    "hinweis",
+    "created_at",
+    "updated_at",
+    "version",
+)
+INVENTORY_AGGREGATE_FIELDS = ("total", "critical", "low", "duplicate_groups", "duplicate_articles")
+CHANGES_PAGE_SIZE = 500
+CHANGES_MAX_PAGE_SIZE = 5000
+IMPORT_TEXT_COLUMNS = ("name", "lagerplatz", "bestelllink", "hinweis")
+IMPORT_INT_COLUMNS = ("bestand", "mindestbestand")
+SCANNER_ACTION_MESSAGES = {
+    "add": "Artikel wurde hinzugefügt.",
+    "remove": "Artikel wurde entnommen.",
+    "correct": "Bestand wurde korrigiert.",
+}
+LABEL_SHEET_DPI = 300
+LABEL_SHEET_COLUMNS = 2
+LABEL_SHEET_ROWS = 6
+LABEL_PAGE_MM = (210.0, 297.0)
+LABEL_MARGIN_MM = (7.0, 21.5)
+LABEL_SIZE_MM = (99.1, 42.3)
+LABEL_GAP_MM = 2.5
+LABEL_POOL_MIN_CODES = 64
+
+def current_tenant() -> str | None:
+    if not has_app_context():
+        return None
+    return g.get("tenant", current_app.config["TENANT"])
+
+
+def tenant_setting(name: str):
+    tenant = current_tenant()
+    if tenant is None:
+        return current_app.config[name]
+    return current_app.config["TENANTS"][tenant][name]
+
+
+class TenantSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        tenant = current_tenant()
+        if bind is None and tenant is not None:
+            return self._db.engines[tenant]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class TenantPathMiddleware:
+    def __init__(self, wsgi_app, tenants) -> None:
+        self.wsgi_app = wsgi_app
+        self.tenants = set(tenants)
+
+    def __call__(self, environ, start_response):
+        segment, _, rest = environ.get("PATH_INFO", "").lstrip("/").partition("/")
+        if segment in self.tenants:
+            environ["lager.tenant"] = segment
+            environ["SCRIPT_NAME"] = f"{environ.get('SCRIPT_NAME', '').rstrip('/')}/{segment}"
+            environ["PATH_INFO"] = f"/{rest}"
+        return self.wsgi_app(environ, start_response)
+
+
+db = SQLAlchemy(session_options={"class_": TenantSession})
 migrate = Migrate()
 
 
+def reserve_change_version(connection) -> int:
+    version = connection.info.get("change_version")
+    if version is None:
+        counter = Versionszaehler.__table__
+        if connection.dialect.name == "postgresql":
+            version = connection.execute(
+                select(func.txid_current() + counter.c.version).where(counter.c.id == 1)
+            ).scalar_one()
+        else:
+            version = connection.execute(
+                update(counter).where(counter.c.id == 1).values(version=counter.c.version + 1).returning(counter.c.version)
+            ).scalar_one()
+        connection.info["change_version"] = version
+    return version
+
+
+def change_version(context) -> int:
+    return reserve_change_version(context.connection)
+
+
+def align_change_version(connection) -> None:
+    if connection.dialect.name != "postgresql":
+        return
+    counter = Versionszaehler.__table__
+    issued = select(func.max(Artikel.version)).union_all(select(func.max(ArtikelLoeschung.version))).subquery()
+    connection.execute(
+        update(counter)
+        .where(counter.c.id == 1)
+        .values(
+            version=func.greatest(
+                counter.c.version,
+                select(func.coalesce(func.max(issued.c[0]), 0)).scalar_subquery() - func.txid_current() + 1,
+            )
+        )
+    )
+
+
+def committed_change_version(connection) -> int | None:
+    if connection.dialect.name != "postgresql":
+        return None
+    counter = Versionszaehler.__table__
+    return connection.execute(
+        select(func.txid_snapshot_xmin(func.txid_current_snapshot()) + counter.c.version).where(counter.c.id == 1)
+    ).scalar_one()
+
+
+@event.listens_for(Engine, "commit")
+@event.listens_for(Engine, "rollback")
+def reset_change_version(connection) -> None:
+    connection.info.pop("change_version", None)
+
+
 class Artikel(db.Model):
+    __table_args__ = (
+        db.Index(
+            "ix_artikel_reorder",
+            "lagerplatz",
+            "name",
+            postgresql_where=text("bestand <= mindestbestand"),
+            sqlite_where=text("bestand <= mindestbestand"),
+        ),
+        db.Index("ix_artikel_version", "version", "id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
+    name_normalized = db.Column(db.String(100), nullable=False, default="", index=True)
     bestand = db.Column(db.Integer, nullable=False, default=0)
     mindestbestand = db.Column(db.Integer, nullable=False, default=0)
     barcode_filename = db.Column(db.String(100), nullable=False)
+    barcode_id = db.Column(db.String(BARCODE_ID_MAX_LENGTH), nullable=False, unique=True, index=True)
     lagerplatz = db.Column(db.String(100), nullable=True)
     bestelllink = db.Column(db.String(300), nullable=True)
     hinweis = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = db.Column(db.BigInteger, nullable=False, default=change_version, onupdate=change_version)
 
-    @property
-    def barcode_id(self) -> str:
-        return barcode_id_from_filename(self.barcode_filename)
+    @validates("name")
+    def validate_name(self, key: str, value: str) -> str:
+        self.name_normalized = normalize_article_name(value)
+        return value
 
     @property
     def status(self) -> str:
-        if self.bestand < self.mindestbestand:
-            return "kritisch"
-        if self.bestand == self.mindestbestand:
-            return "knapp"
-        return "ausreichend"
+        return stock_status(self.bestand, self.mindestbestand)
+
+
+class Lagerbewegung(db.Model):
+    __table_args__ = (db.Index("ix_lagerbewegung_artikel_created", "artikel_id", "created_at"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    artikel_id = db.Column(db.Integer, nullable=False)
+    delta = db.Column(db.Integer, nullable=False)
+    bestand = db.Column(db.Integer, nullable=False)
+    action = db.Column(db.String(20), nullable=False)
+    source = db.Column(db.String(50), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+
+class ArtikelLoeschung(db.Model):
+    __table_args__ = (db.Index("ix_artikel_loeschung_version", "version", "artikel_id"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    artikel_id = db.Column(db.Integer, nullable=False)
+    barcode_id = db.Column(db.String(100), nullable=False)
+    version = db.Column(db.BigInteger, nullable=False, default=change_version)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class Versionszaehler(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+class BarcodeZaehler(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    next_value = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+class ArtikelKennzahl(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    critical = db.Column(db.Integer, nullable=False, default=0)
+    low = db.Column(db.Integer, nullable=False, default=0)
+    duplicate_groups = db.Column(db.Integer, nullable=False, default=0)
+    duplicate_articles = db.Column(db.Integer, nullable=False, default=0)
+
+
+class ArtikelNamensgruppe(db.Model):
+    name_normalized = db.Column(db.String(100), primary_key=True)
+    anzahl = db.Column(db.Integer, nullable=False, default=0)
+
+
+class Job(db.Model):
+    __table_args__ = (db.Index("ix_job_status_id", "status", "id"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default="{}")
+    status = db.Column(db.String(20), nullable=False, default="queued")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    result = db.Column(db.Text, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+
+class ScannerBuchung(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    client_uuid = db.Column(db.String(64), nullable=False, unique=True, index=True)
+    artikel_id = db.Column(db.Integer, nullable=False)
+    action = db.Column(db.String(20), nullable=False)
+    amount = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+def stock_status(bestand: int, mindestbestand: int) -> str:
+    if bestand < mindestbestand:
+        return "kritisch"
+    if bestand == mindestbestand:
+        return "knapp"
+    return "ausreichend"
 
 
 def compact_whitespace(value: str | None) -> str:
@@ -76,14 +353,15 @@ def normalize_article_name(value: str | None) -> str:
     return compact_whitespace(value).lower()
 
 
-def barcode_id_from_filename(filename: str | None) -> str:
-    if not filename:
-        return ""
-    return filename[:-4] if filename.endswith(".png") else filename
+def normalize_scanned_barcode_id(raw_code: str | None) -> str:
+    if raw_code and BARE_BARCODE_RE.fullmatch(raw_code):
+        return raw_code.lower()
+    return parse_scanned_barcode_id(raw_code or "")
 
 
-def normalize_scanned_barcode_id(raw_code: str | None) -> str:
-    value = re.sub(r"\s+", "", raw_code or "")
+@lru_cache(maxsize=4096)
+def parse_scanned_barcode_id(raw_code: str) -> str:
+    value = WHITESPACE_RE.sub("", raw_code)
     value = value.strip("\"'<>")
     if not value:
         return ""
@@ -101,70 +379,295 @@ def normalize_scanned_barcode_id(raw_code: str | None) -> str:
                 break
 
     value = unquote(value).strip("\"'<>")
-    value = re.sub(r"\.png", "", value, flags=re.IGNORECASE)
+    value = PNG_SUFFIX_RE.sub("", value)
     return value.lower()
 
 
-def ensure_column(table: str, column: str, ddl_pg: str, ddl_sqlite: str) -> None:
-    dialect = db.engine.dialect.name
-    try:
-        if dialect == "postgresql":
-            db.session.execute(
-                text(
-                    f"""
-                    DO $$
-                    BEGIN
-                        IF NOT EXISTS (
-                            SELECT 1 FROM information_schema.columns
-                            WHERE table_name='{table}' AND column_name='{column}'
-                        ) THEN
-                            ALTER TABLE {table} ADD COLUMN {ddl_pg};
-                        END IF;
-                    END;
-                    $$;
-                    """
-                )
+def include_schema_object(obj, name: str, type_: str, reflected: bool, compare_to) -> bool:
+    return not (reflected and compare_to is None and name.startswith(("artikel_search", "ix_artikel_search")))
+
+
+class LRUCache:
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = max(0, maxsize)
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._items.move_to_end(key)
+            except KeyError:
+                return default
+            return self._items[key]
+
+    def set(self, key, value) -> None:
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._items.pop(key, default)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class ScannerStamps:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS scanner_stamp ("
+                "tenant TEXT NOT NULL, barcode_id TEXT NOT NULL, stamp INTEGER NOT NULL, "
+                "PRIMARY KEY (tenant, barcode_id))"
             )
-        else:
-            cols = db.session.execute(text(f"PRAGMA table_info({table})")).fetchall()
-            names = [row[1] for row in cols]
-            if column not in names:
-                db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN {ddl_sqlite};"))
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
 
+    def read(self, tenant: str | None, barcode_id: str) -> int | None:
+        try:
+            return self.connection().execute(
+                "SELECT coalesce(sum(stamp), 0) FROM scanner_stamp WHERE tenant = ? AND barcode_id IN (?, '')",
+                (tenant or "", barcode_id),
+            ).fetchone()[0]
+        except sqlite3.Error:
+            return None
+
+    def bump(self, entries) -> None:
+        connection = self.connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(
+                "INSERT INTO scanner_stamp (tenant, barcode_id, stamp) VALUES (?, ?, 1) "
+                "ON CONFLICT (tenant, barcode_id) DO UPDATE SET stamp = stamp + 1",
+                [(tenant or "", barcode_id or "") for tenant, barcode_id in entries],
+            )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+
+class Metrics:
+    LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._latency: dict[tuple[str, str], list] = {}
+        self._counters: dict[tuple[str, tuple], float] = defaultdict(float)
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[(name, tuple(sorted(labels.items())))] += value
+
+    def observe_request(self, endpoint: str, method: str, duration: float) -> None:
+        with self._lock:
+            buckets, totals = self._latency.setdefault(
+                (endpoint, method), ([0] * len(self.LATENCY_BUCKETS), [0.0, 0])
+            )
+            for index, bound in enumerate(self.LATENCY_BUCKETS):
+                if duration <= bound:
+                    buckets[index] += 1
+            totals[0] += duration
+            totals[1] += 1
+
+    def render(self) -> str:
+        lines = [
+            "# HELP lager_http_request_duration_seconds Request latency per route.",
+            "# TYPE lager_http_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            for (endpoint, method), (buckets, (total, count)) in sorted(self._latency.items()):
+                labels = f'endpoint="{endpoint}",method="{method}"'
+                for bound, bucket in zip(self.LATENCY_BUCKETS, buckets):
+                    lines.append(f'lager_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {bucket}')
+                lines.append(f'lager_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+                lines.append(f"lager_http_request_duration_seconds_sum{{{labels}}} {total}")
+                lines.append(f"lager_http_request_duration_seconds_count{{{labels}}} {count}")
+
+            seen: set[str] = set()
+            for (name, labels), value in sorted(self._counters.items()):
+                if name not in seen:
+                    seen.add(name)
+                    lines.append(f"# TYPE {name} counter")
+                label_text = ",".join(f'{key}="{label}"' for key, label in labels)
+                value = int(value) if value.is_integer() else value
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+barcode_image_cache = LRUCache(Config.QR_CACHE_SIZE)
+scanner_payload_caches: dict[str | None, LRUCache] = {}
+scanner_stamps = ScannerStamps(Config.SCANNER_STAMP_PATH)
+
+
+def render_qr_png(modules: int, matrix: bytes, box_size: int) -> bytes:
+    image = Image.frombytes("L", (modules, modules), matrix).convert("1", dither=Image.Dither.NONE)
+    if box_size > 1:
+        image = image.resize((modules * box_size, modules * box_size), Image.Resampling.NEAREST)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def render_qr_svg(modules: int, matrix: bytes, box_size: int) -> bytes:
+    path = []
+    for y in range(modules):
+        x = 0
+        for run in QR_DARK_RUN_RE.finditer(matrix, y * modules, (y + 1) * modules):
+            start = run.start() - y * modules
+            path.append(f"m{start - x} 0h{run.end() - run.start()}" if x else f"M{start} {y}.5h{run.end() - run.start()}")
+            x = run.end() - y * modules
+    size = modules * box_size
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {modules} {modules}" shape-rendering="crispEdges">'
+        f'<rect width="{modules}" height="{modules}" fill="#fff"/>'
+        f'<path stroke="#000" d="{"".join(path)}"/></svg>'
+    ).encode("ascii")
+
+
+def render_barcode_image(barcode_id: str, fmt: str = "png", size: str = "screen") -> tuple[bytes, str]:
+    key = (barcode_id, fmt, size)
+    cached = barcode_image_cache.get(key)
+    if cached is not None:
+        metrics.inc("lager_qr_cache_hits_total")
+        return cached
+
+    metrics.inc("lager_qr_renders_total")
+    modules, matrix = qr_matrix(barcode_id)
+    render = render_qr_svg if fmt == "svg" else render_qr_png
+    data = render(modules, matrix, QR_SIZE_PRESETS[size])
+
+    rendered = (data, hashlib.sha256(data).hexdigest()[:32])
+    barcode_image_cache.set(key, rendered)
+    return rendered
+
+
+def multiply_barcode_digit(digit: int, exponent: int) -> int:
+    for _ in range(exponent):
+        digit <<= 1
+        if digit & len(BARCODE_ALPHABET):
+            digit ^= BARCODE_CHECK_POLYNOMIAL
+    return digit
+
+
+BARCODE_CHECK_TABLE = tuple(
+    tuple(multiply_barcode_digit(digit, BARCODE_BODY_LENGTH - position) for digit in range(len(BARCODE_ALPHABET)))
+    for position in range(BARCODE_BODY_LENGTH)
+)
 
-def bootstrap_database() -> None:
-    db.create_all()
-    ensure_column("artikel", "lagerplatz", "lagerplatz VARCHAR(100)", "lagerplatz VARCHAR(100)")
-    ensure_column("artikel", "bestelllink", "bestelllink VARCHAR(300)", "bestelllink VARCHAR(300)")
-    ensure_column("artikel", "hinweis", "hinweis TEXT", "hinweis TEXT")
-    ensure_column(
-        "artikel",
-        "created_at",
-        "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
-        "created_at DATETIME DEFAULT (CURRENT_TIMESTAMP)",
-    )
 
+def barcode_check_char(body: str) -> str:
+    total = 0
+    for weights, char in zip(BARCODE_CHECK_TABLE, body):
+        total ^= weights[BARCODE_DIGITS[char]]
+    return BARCODE_ALPHABET[total]
+
+
+def encode_barcode_id(value: int) -> str:
+    if not 0 <= value < len(BARCODE_ALPHABET) ** BARCODE_BODY_LENGTH:
+        raise ValueError("Barcode-Nummernkreis erschöpft.")
+    body = "".join(BARCODE_ALPHABET[(value >> shift) & 31] for shift in BARCODE_SHIFTS)
+    return body + barcode_check_char(body)
+
+
+def is_allocated_barcode_id(barcode_id: str) -> bool:
+    return len(barcode_id) == BARCODE_BODY_LENGTH + 1 and all(char in BARCODE_DIGITS for char in barcode_id)
+
+
+def barcode_checksum_ok(barcode_id: str) -> bool:
+    if not is_allocated_barcode_id(barcode_id):
+        return True
+    return barcode_check_char(barcode_id[:-1]) == barcode_id[-1]
+
+
+def reserve_barcode_values(connection, count: int) -> int:
+    counter = BarcodeZaehler.__table__
+    return connection.execute(
+        update(counter)
+        .where(counter.c.id == 1)
+        .values(next_value=counter.c.next_value + count)
+        .returning(counter.c.next_value)
+    ).scalar_one()
+
+
+class BarcodeAllocator:
+    def __init__(self, block_size: int) -> None:
+        self.block_size = max(1, block_size)
+        self._blocks: dict = {}
+        self._lock = threading.Lock()
+
+    def allocate(self, count: int) -> list[int]:
+        engine = db.session.get_bind()
+        if engine.dialect.name == "sqlite":
+            end = reserve_barcode_values(db.session, count)
+            return list(range(end - count, end))
+        return self.allocate_from(engine, count)
+
+    def allocate_from(self, engine, count: int) -> list[int]:
+        values: list[int] = []
+        with self._lock:
+            start, end = self._blocks.get(engine, (0, 0))
+            while len(values) < count:
+                if start >= end:
+                    size = -(-(count - len(values)) // self.block_size) * self.block_size
+                    with engine.begin() as connection:
+                        end = reserve_barcode_values(connection, size)
+                    start = end - size
+                take = min(end - start, count - len(values))
+                values.extend(range(start, start + take))
+                start += take
+            self._blocks[engine] = (start, end)
+        return values
+
+    def reset(self) -> None:
+        self._blocks = {}
+        self._lock = threading.Lock()
+
+
+barcode_allocator = BarcodeAllocator(Config.BARCODE_BLOCK_SIZE)
+os.register_at_fork(after_in_child=barcode_allocator.reset)
+
+
+def generate_barcode_ids(count: int, reserved: set[str] | None = None) -> list[str]:
+    reserved = reserved or set()
+    barcode_ids: list[str] = []
+    while len(barcode_ids) < count:
+        candidates = [
+            barcode_id
+            for barcode_id in map(encode_barcode_id, barcode_allocator.allocate(count - len(barcode_ids)))
+            if barcode_id not in reserved
+        ]
+        taken = set(db.session.scalars(select(Artikel.barcode_id).where(Artikel.barcode_id.in_(candidates))))
+        barcode_ids.extend(barcode_id for barcode_id in candidates if barcode_id not in taken)
+    return barcode_ids
 
-def ensure_barcode_image(barcode_id: str) -> None:
-    upload_folder = Path(current_app.config["UPLOAD_FOLDER"])
-    upload_folder.mkdir(parents=True, exist_ok=True)
-    path = upload_folder / f"{barcode_id}.png"
-    if path.exists():
-        return
 
-    qr = qrcode.QRCode(
-        version=2,
-        error_correction=qrcode.constants.ERROR_CORRECT_M,
-        box_size=6,
-        border=2,
-    )
-    qr.add_data(barcode_id)
-    qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
-    img.save(path)
+def generate_barcode_id() -> str:
+    return generate_barcode_ids(1)[0]
 
 
 def build_article_form_data(artikel: Artikel | None = None, source: dict | None = None) -> dict[str, str]:
@@ -214,28 +717,30 @@ def get_duplicate_matches(name: str, exclude_id: int | None = None) -> list[Arti
     if not normalized_name:
         return []
 
-    matches: list[Artikel] = []
-    kandidaten = Artikel.query.order_by(Artikel.created_at.desc(), Artikel.id.desc()).all()
-    for kandidat in kandidaten:
-        if exclude_id is not None and kandidat.id == exclude_id:
-            continue
-        if normalize_article_name(kandidat.name) == normalized_name:
-            matches.append(kandidat)
-    return matches
+    query = Artikel.query.filter(Artikel.name_normalized == normalized_name)
+    if exclude_id is not None:
+        query = query.filter(Artikel.id != exclude_id)
+    return query.order_by(Artikel.created_at.desc(), Artikel.id.desc()).all()
 
 
 def build_duplicate_groups() -> list[dict]:
+    duplicate_names = (
+        db.session.query(Artikel.name_normalized)
+        .filter(Artikel.name_normalized != "")
+        .group_by(Artikel.name_normalized)
+        .having(func.count(Artikel.id) > 1)
+    )
     groups: dict[str, list[Artikel]] = defaultdict(list)
-    artikel = Artikel.query.order_by(Artikel.name.asc(), Artikel.id.asc()).all()
+    artikel = (
+        Artikel.query.filter(Artikel.name_normalized.in_(duplicate_names.scalar_subquery()))
+        .order_by(Artikel.name.asc(), Artikel.id.asc())
+        .all()
+    )
     for item in artikel:
-        normalized_name = normalize_article_name(item.name)
-        if normalized_name:
-            groups[normalized_name].append(item)
+        groups[item.name_normalized].append(item)
 
     duplicate_groups: list[dict] = []
     for normalized_name, items in groups.items():
-        if len(items) < 2:
-            continue
         variant_names = sorted({compact_whitespace(item.name) for item in items})
         duplicate_groups.append(
             {
@@ -258,6 +763,388 @@ def build_duplicate_groups() -> list[dict]:
     return duplicate_groups
 
 
+def bestelllink_host(link: str | None) -> str:
+    link = (link or "").strip()
+    if link and "://" not in link:
+        link = f"//{link}"
+    host = urlparse(link).hostname or ""
+    return host.removeprefix("www.")
+
+
+def query_reorder_items() -> list[dict]:
+    rows = db.session.execute(
+        select(
+            Artikel.id,
+            Artikel.name,
+            Artikel.bestand,
+            Artikel.mindestbestand,
+            Artikel.lagerplatz,
+            Artikel.bestelllink,
+            Artikel.barcode_id,
+        )
+        .where(Artikel.bestand <= Artikel.mindestbestand)
+        .order_by(Artikel.lagerplatz.asc(), Artikel.name.asc(), Artikel.id.asc())
+    ).all()
+    return [
+        {
+            "id": row.id,
+            "name": row.name,
+            "bestand": row.bestand,
+            "mindestbestand": row.mindestbestand,
+            "fehlmenge": row.mindestbestand - row.bestand,
+            "status": stock_status(row.bestand, row.mindestbestand),
+            "lagerplatz": row.lagerplatz or "",
+            "bestelllink": row.bestelllink or "",
+            "lieferant": bestelllink_host(row.bestelllink),
+            "barcode_id": row.barcode_id,
+        }
+        for row in rows
+    ]
+
+
+def build_reorder_groups(items: list[dict], group_by: str) -> list[dict]:
+    groups: dict[str, list[dict]] = defaultdict(list)
+    for item in items:
+        groups[item[group_by]].append(item)
+
+    empty_label = "Ohne Bestelllink" if group_by == "lieferant" else "Ohne Lagerplatz"
+    return [
+        {
+            "key": key,
+            "label": key or empty_label,
+            "count": len(group_items),
+            "critical": sum(1 for item in group_items if item["status"] == "kritisch"),
+            "fehlmenge": sum(item["fehlmenge"] for item in group_items),
+            "items": group_items,
+        }
+        for key, group_items in sorted(groups.items(), key=lambda group: (not group[0], group[0].lower()))
+    ]
+
+
+def write_reorder_digest(handle, items: list[dict]) -> None:
+    writer = csv.writer(handle, delimiter=";", lineterminator="\r\n")
+    writer.writerow(REORDER_CSV_COLUMNS)
+    for item in sorted(items, key=lambda item: (not item["lieferant"], item["lieferant"], item["lagerplatz"], item["name"])):
+        writer.writerow([item[column] for column in REORDER_CSV_COLUMNS])
+
+
+def build_inventory_summary() -> dict[str, int]:
+    total, critical, low = db.session.query(
+        func.count(Artikel.id),
+        func.coalesce(func.sum(case((Artikel.bestand < Artikel.mindestbestand, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((Artikel.bestand == Artikel.mindestbestand, 1), else_=0)), 0),
+    ).one()
+    return {"total": total, "critical": critical, "low": low}
+
+
+def count_duplicates() -> tuple[int, int]:
+    groups = (
+        db.session.query(func.count(Artikel.id).label("count"))
+        .filter(Artikel.name_normalized != "")
+        .group_by(Artikel.name_normalized)
+        .having(func.count(Artikel.id) > 1)
+        .subquery()
+    )
+    group_count, article_count = db.session.query(
+        func.count(), func.coalesce(func.sum(groups.c.count), 0)
+    ).one()
+    return group_count, article_count
+
+
+def compute_inventory_aggregates() -> dict[str, int]:
+    duplicate_groups, duplicate_articles = count_duplicates()
+    return {**build_inventory_summary(), "duplicate_groups": duplicate_groups, "duplicate_articles": duplicate_articles}
+
+
+def read_inventory_aggregates() -> dict[str, int]:
+    columns = [getattr(ArtikelKennzahl, field) for field in INVENTORY_AGGREGATE_FIELDS]
+    row = db.session.execute(select(*columns).where(ArtikelKennzahl.id == 1)).first()
+    if row is None:
+        return compute_inventory_aggregates()
+    return dict(row._mapping)
+
+
+def check_inventory_aggregates(fix: bool = False) -> tuple[dict[str, tuple], int]:
+    stored = db.session.execute(select(ArtikelKennzahl).where(ArtikelKennzahl.id == 1).with_for_update()).scalar()
+    actual = compute_inventory_aggregates()
+    drift = {
+        field: (getattr(stored, field, None), value)
+        for field, value in actual.items()
+        if getattr(stored, field, None) != value
+    }
+    stored_groups = dict(db.session.execute(select(ArtikelNamensgruppe.name_normalized, ArtikelNamensgruppe.anzahl)).all())
+    actual_groups = dict(
+        db.session.execute(select(Artikel.name_normalized, func.count()).group_by(Artikel.name_normalized)).all()
+    )
+    group_mismatches = sum(
+        1 for name in stored_groups.keys() | actual_groups.keys() if stored_groups.get(name) != actual_groups.get(name)
+    )
+
+    if fix and (drift or group_mismatches):
+        db.session.execute(ArtikelNamensgruppe.__table__.delete())
+        db.session.execute(
+            insert(ArtikelNamensgruppe).from_select(
+                ["name_normalized", "anzahl"],
+                select(Artikel.name_normalized, func.count()).group_by(Artikel.name_normalized),
+            )
+        )
+        db.session.merge(ArtikelKennzahl(id=1, **actual))
+        db.session.commit()
+    else:
+        db.session.rollback()
+    return drift, group_mismatches
+
+
+def encode_cursor(value, artikel_id: int) -> str:
+    raw = json.dumps([value, artikel_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def is_cursor_value(value, value_type: type) -> bool:
+    if isinstance(value, bool) or not isinstance(value, value_type):
+        return False
+    return value_type is not int or -(2**63) <= value < 2**63
+
+
+def decode_cursor(cursor: str | None, value_type: type = int) -> tuple | None:
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, artikel_id = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    if not is_cursor_value(value, value_type) or not is_cursor_value(artikel_id, int):
+        return None
+    return value, artikel_id
+
+
+def build_index_filters(args) -> dict[str, str | int]:
+    status = (args.get("status") or "alle").strip().lower()
+    if status not in INDEX_STATUS_OPTIONS:
+        status = "alle"
+    sort = (args.get("sort") or "name").strip().lower()
+    if sort not in INDEX_SORT_OPTIONS:
+        sort = "name"
+    try:
+        limit = int(args.get("limit") or current_app.config["INDEX_PAGE_SIZE"])
+    except ValueError:
+        limit = current_app.config["INDEX_PAGE_SIZE"]
+
+    return {
+        "q": compact_whitespace(args.get("q")),
+        "status": status,
+        "sort": sort,
+        "after": (args.get("after") or "").strip(),
+        "limit": min(max(limit, 1), 500),
+    }
+
+
+def query_inventory(filters: dict[str, str | int]) -> tuple[list[Artikel], str | None, int]:
+    query = Artikel.query
+
+    if filters["q"]:
+        pattern = f"%{filters['q']}%"
+        query = query.filter(
+            or_(
+                Artikel.name.ilike(pattern),
+                Artikel.lagerplatz.ilike(pattern),
+                Artikel.barcode_id.ilike(pattern),
+                Artikel.hinweis.ilike(pattern),
+            )
+        )
+    if filters["status"] == "kritisch":
+        query = query.filter(Artikel.bestand < Artikel.mindestbestand)
+    elif filters["status"] == "knapp":
+        query = query.filter(Artikel.bestand == Artikel.mindestbestand)
+    elif filters["status"] == "ausreichend":
+        query = query.filter(Artikel.bestand > Artikel.mindestbestand)
+
+    match_count = query.order_by(None).count()
+
+    sort = filters["sort"]
+    descending = sort.endswith("_desc") or sort == "neu"
+    column = {"name": Artikel.name, "bestand": Artikel.bestand, "neu": Artikel.id}[sort.removesuffix("_desc")]
+    cursor = decode_cursor(filters["after"], str if column is Artikel.name else int)
+    if cursor:
+        value, last_id = cursor
+        if column is Artikel.id:
+            query = query.filter(Artikel.id < last_id)
+        elif descending:
+            query = query.filter(tuple_(column, Artikel.id) < tuple_(value, last_id))
+        else:
+            query = query.filter(tuple_(column, Artikel.id) > tuple_(value, last_id))
+
+    if descending:
+        query = query.order_by(column.desc(), Artikel.id.desc())
+    else:
+        query = query.order_by(column.asc(), Artikel.id.asc())
+
+    artikel = query.limit(filters["limit"] + 1).all()
+    next_cursor = None
+    if len(artikel) > filters["limit"]:
+        artikel = artikel[: filters["limit"]]
+        last = artikel[-1]
+        next_cursor = encode_cursor(getattr(last, column.key), last.id)
+    return artikel, next_cursor, match_count
+
+
+def article_index_url(artikel: Artikel) -> str:
+    previous = db.session.execute(
+        select(Artikel.name, Artikel.id)
+        .where(tuple_(Artikel.name, Artikel.id) < tuple_(artikel.name, artikel.id))
+        .order_by(Artikel.name.desc(), Artikel.id.desc())
+        .limit(1)
+    ).first()
+    after = encode_cursor(previous.name, previous.id) if previous else None
+    return url_for("index", after=after) + f"#art-{artikel.id}"
+
+
+search_backends: dict = {}
+
+
+def search_backend() -> str:
+    engine = db.session.get_bind()
+    backend = search_backends.get(engine)
+    if backend is None:
+        backend = "like"
+        try:
+            if engine.dialect.name == "postgresql":
+                if db.session.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first():
+                    backend = "trigram"
+            elif engine.dialect.name == "sqlite":
+                if db.session.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'artikel_search'")).first():
+                    backend = "fts5"
+        except Exception:
+            db.session.rollback()
+        search_backends[engine] = backend
+    return backend
+
+
+def search_terms(query: str | None) -> list[str]:
+    return list(dict.fromkeys(normalize_article_name(query).split()))[:SEARCH_MAX_TERMS]
+
+
+def text_trigrams(value: str) -> set[str]:
+    padded = f"  {value} "
+    return {padded[index : index + 3] for index in range(len(padded) - 2)}
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_candidate_ids(terms: list[str]) -> list[int]:
+    backend = search_backend()
+    params: dict[str, str | int] = {"limit": SEARCH_CANDIDATE_LIMIT}
+
+    if backend == "fts5" and any(len(term) >= 3 for term in terms):
+        groups = []
+        conditions = []
+        for index, term in enumerate(terms):
+            if len(term) >= 3:
+                grams = sorted({term[offset : offset + 3] for offset in range(len(term) - 2)})
+                groups.append("(" + " OR ".join('"' + gram.replace('"', '""') + '"' for gram in grams) + ")")
+            else:
+                params[f"like_{index}"] = f"%{escape_like(term)}%"
+                conditions.append(f"{SEARCH_TEXT_SQL} LIKE :like_{index} ESCAPE '\\'")
+        params["match"] = " AND ".join(groups)
+        return list(
+            db.session.scalars(
+                text(
+                    "SELECT rowid FROM artikel_search WHERE artikel_search MATCH :match "
+                    + "".join(f"AND {condition} " for condition in conditions)
+                    + "ORDER BY rank LIMIT :limit"
+                ),
+                params,
+            )
+        )
+
+    if backend == "trigram":
+        conditions = []
+        for index, term in enumerate(terms):
+            params[f"like_{index}"] = f"%{escape_like(term)}%"
+            params[f"term_{index}"] = term
+            conditions.append(f"({SEARCH_TEXT_SQL} LIKE :like_{index} OR :term_{index} <% {SEARCH_TEXT_SQL})")
+        params["query"] = " ".join(terms)
+        return list(
+            db.session.scalars(
+                text(
+                    f"SELECT id FROM artikel WHERE {' AND '.join(conditions)} "
+                    f"ORDER BY word_similarity(:query, {SEARCH_TEXT_SQL}) DESC, id LIMIT :limit"
+                ),
+                params,
+            )
+        )
+
+    search_text = func.lower(Artikel.name + " " + func.coalesce(Artikel.lagerplatz, "") + " " + Artikel.barcode_id)
+    return list(
+        db.session.scalars(
+            select(Artikel.id)
+            .where(*[search_text.contains(term, autoescape=True) for term in terms])
+            .limit(SEARCH_CANDIDATE_LIMIT)
+        )
+    )
+
+
+def score_search_term(term: str, words: list[str]) -> float:
+    best = 0.0
+    term_grams = text_trigrams(term)
+    for word in words:
+        if word.startswith(term):
+            return 1.0
+        if term in word:
+            best = max(best, 0.8)
+            continue
+        word_grams = text_trigrams(word)
+        similarity = len(term_grams & word_grams) / len(term_grams | word_grams)
+        if similarity >= SEARCH_MIN_SIMILARITY:
+            best = max(best, 0.7 * similarity)
+    return best
+
+
+def search_articles(query: str | None, limit: int) -> list[dict]:
+    terms = search_terms(query)
+    if not terms:
+        return []
+    candidate_ids = search_candidate_ids(terms)
+    if not candidate_ids:
+        return []
+
+    rows = db.session.execute(
+        select(
+            Artikel.id,
+            Artikel.name,
+            Artikel.barcode_id,
+            Artikel.lagerplatz,
+            Artikel.bestand,
+            Artikel.mindestbestand,
+        ).where(Artikel.id.in_(candidate_ids))
+    ).all()
+
+    scored = []
+    for row in rows:
+        words = f"{normalize_article_name(row.name)} {(row.lagerplatz or '').lower()} {row.barcode_id}".split()
+        term_scores = [score_search_term(term, words) for term in terms]
+        if all(term_scores):
+            scored.append((sum(term_scores) / len(term_scores), row))
+    scored.sort(key=lambda item: (-item[0], len(item[1].name), item[1].name.lower(), item[1].id))
+
+    return [
+        {
+            "id": row.id,
+            "name": row.name,
+            "barcode_id": row.barcode_id,
+            "lagerplatz": row.lagerplatz or "",
+            "bestand": row.bestand,
+            "mindestbestand": row.mindestbestand,
+            "status": stock_status(row.bestand, row.mindestbestand),
+            "score": round(score, 3),
+        }
+        for score, row in scored[:limit]
+    ]
+
+
 def parse_date(value: str | None, *, end_of_day: bool = False) -> datetime | None:
     if not value:
         return None
@@ -291,7 +1178,7 @@ def query_barcodes(filters: dict[str, str]) -> tuple[list[Artikel], str]:
     if filters["name"]:
         query = query.filter(Artikel.name.ilike(f"%{filters['name']}%"))
     if filters["barcode"]:
-        query = query.filter(Artikel.barcode_filename.ilike(f"%{filters['barcode']}%"))
+        query = query.filter(Artikel.barcode_id.ilike(f"%{filters['barcode']}%"))
     if filters["location"]:
         query = query.filter(Artikel.lagerplatz.ilike(f"%{filters['location']}%"))
 
@@ -323,12 +1210,473 @@ def query_barcodes(filters: dict[str, str]) -> tuple[list[Artikel], str]:
     else:
         artikel = query.order_by(Artikel.name.asc(), Artikel.id.asc()).all()
 
-    for item in artikel:
-        ensure_barcode_image(item.barcode_id)
-
     return artikel, active_label
 
 
+label_pool: ProcessPoolExecutor | None = None
+label_pool_lock = threading.Lock()
+label_pool_users = 0
+label_pool_timer: threading.Timer | None = None
+
+
+def mm_to_px(value: float) -> int:
+    return round(value * LABEL_SHEET_DPI / 25.4)
+
+
+def pt_to_px(value: float) -> int:
+    return round(value * LABEL_SHEET_DPI / 72)
+
+
+def label_page_size() -> tuple[int, int]:
+    return mm_to_px(LABEL_PAGE_MM[0]), mm_to_px(LABEL_PAGE_MM[1])
+
+
+@lru_cache(maxsize=8)
+def label_font(size: int):
+    try:
+        return ImageFont.load_default(size=size)
+    except (AttributeError, TypeError, ImportError):
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=4096)
+def qr_matrix(barcode_id: str) -> tuple[int, bytes]:
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_M,
+        border=2,
+    )
+    qr.add_data(barcode_id)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+    return len(matrix), b"".join(b"\x00" if cell else b"\xff" for row in matrix for cell in row)
+
+
+@lru_cache(maxsize=64)
+def label_qr_image(barcode_id: str, size: int) -> Image.Image:
+    modules, data = qr_matrix(barcode_id)
+    return (
+        Image.frombytes("L", (modules, modules), data)
+        .resize((size, size), Image.Resampling.NEAREST)
+        .convert("1", dither=Image.Dither.NONE)
+    )
+
+
+def fit_label_text(value: str, font, width: int) -> str:
+    full_width = font.getlength(value)
+    if full_width <= width:
+        return value
+    end = int(len(value) * width / full_width)
+    while end > 0 and font.getlength(value[:end].rstrip() + "…") > width:
+        end -= 1
+    return value[:end].rstrip() + "…"
+
+
+def render_label_page(items: list[tuple[str, str]]) -> Image.Image:
+    label_width, label_height = mm_to_px(LABEL_SIZE_MM[0]), mm_to_px(LABEL_SIZE_MM[1])
+    margin_x, margin_y = mm_to_px(LABEL_MARGIN_MM[0]), mm_to_px(LABEL_MARGIN_MM[1])
+    gap = mm_to_px(LABEL_GAP_MM)
+    padding = mm_to_px(2)
+    name_font, code_font = label_font(pt_to_px(12)), label_font(pt_to_px(9))
+    name_height, code_height = pt_to_px(12) + padding // 2, pt_to_px(9) + padding // 2
+    qr_size = label_height - 2 * padding - name_height - code_height
+
+    page = Image.new("1", label_page_size(), 1)
+    draw = ImageDraw.Draw(page)
+    for slot, (name, barcode_id) in enumerate(items):
+        column, row = slot % LABEL_SHEET_COLUMNS, slot // LABEL_SHEET_COLUMNS
+        left = margin_x + column * (label_width + gap)
+        top = margin_y + row * label_height
+        center = left + label_width // 2
+
+        name = fit_label_text(name or "", name_font, label_width - 2 * padding)
+        draw.text((center, top + padding), name, font=name_font, fill=0, anchor="ma")
+        page.paste(label_qr_image(barcode_id, qr_size), (center - qr_size // 2, top + padding + name_height))
+        draw.text((center, top + padding + name_height + qr_size), barcode_id, font=code_font, fill=0, anchor="ma")
+    return page
+
+
+def render_label_page_data(items: list[tuple[str, str]]) -> bytes:
+    return zlib.compress(render_label_page(items).tobytes(), 6)
+
+
+def get_label_pool(workers: int) -> ProcessPoolExecutor | None:
+    global label_pool, label_pool_users
+    if workers < 2:
+        return None
+    with label_pool_lock:
+        if label_pool is None:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            label_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method))
+        if label_pool_timer is not None:
+            label_pool_timer.cancel()
+        label_pool_users += 1
+        return label_pool
+
+
+def release_label_pool(idle_timeout: float) -> None:
+    global label_pool_users, label_pool_timer
+    with label_pool_lock:
+        label_pool_users -= 1
+        if label_pool_users or label_pool is None:
+            return
+        label_pool_timer = threading.Timer(idle_timeout, shutdown_idle_label_pool)
+        label_pool_timer.daemon = True
+        label_pool_timer.start()
+
+
+def shutdown_idle_label_pool() -> None:
+    global label_pool
+    with label_pool_lock:
+        if label_pool_users or label_pool is None:
+            return
+        pool, label_pool = label_pool, None
+    pool.shutdown(wait=False)
+
+
+def chunk_label_items(items: list[tuple[str, str]]) -> list[list[tuple[str, str]]]:
+    per_page = LABEL_SHEET_COLUMNS * LABEL_SHEET_ROWS
+    return [items[start : start + per_page] for start in range(0, len(items), per_page)]
+
+
+def iter_label_pages(items: list[tuple[str, str]], workers: int):
+    global label_pool
+    chunks = chunk_label_items(items)
+    pool = get_label_pool(workers) if len(chunks) > 1 else None
+    if pool is not None:
+        try:
+            yield from pool.map(render_label_page_data, chunks)
+            return
+        except BrokenProcessPool:
+            with label_pool_lock:
+                if label_pool is pool:
+                    label_pool = None
+            raise
+        finally:
+            release_label_pool(current_app.config["LABEL_POOL_IDLE_TIMEOUT"])
+    for chunk in chunks:
+        yield render_label_page_data(chunk)
+
+
+def stream_label_pdf(pages):
+    width_pt, height_pt = (round(value * 72 / 25.4, 2) for value in LABEL_PAGE_MM)
+    width_px, height_px = label_page_size()
+    offsets: dict[int, int] = {}
+    written = 0
+    page_refs: list[int] = []
+
+    def emit(number: int, body: bytes) -> bytes:
+        nonlocal written
+        chunk = f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+        offsets[number] = written
+        written += len(chunk)
+        return chunk
+
+    header = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+    written += len(header)
+    yield header
+    yield emit(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+
+    number = 3
+    for data in pages:
+        image_ref, content_ref, page_ref = number, number + 1, number + 2
+        number += 3
+        yield emit(
+            image_ref,
+            (
+                f"<< /Type /XObject /Subtype /Image /Width {width_px} /Height {height_px} "
+                f"/ColorSpace /DeviceGray /BitsPerComponent 1 /Filter /FlateDecode /Length {len(data)} >>\nstream\n"
+            ).encode()
+            + data
+            + b"\nendstream",
+        )
+        content = f"q {width_pt} 0 0 {height_pt} 0 0 cm /Im0 Do Q".encode()
+        yield emit(content_ref, f"<< /Length {len(content)} >>\nstream\n".encode() + content + b"\nendstream")
+        yield emit(
+            page_ref,
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width_pt} {height_pt}] "
+                f"/Resources << /XObject << /Im0 {image_ref} 0 R >> >> /Contents {content_ref} 0 R >>"
+            ).encode(),
+        )
+        page_refs.append(page_ref)
+
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs)
+    yield emit(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(page_refs)} >>".encode())
+
+    xref_offset = written
+    lines = [f"xref\n0 {number}\n", "0000000000 65535 f \n"]
+    lines.extend(f"{offsets[ref]:010d} 00000 n \n" for ref in range(1, number))
+    lines.append(f"trailer\n<< /Size {number} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n")
+    yield "".join(lines).encode()
+
+
+def movement_source() -> str:
+    return (request.endpoint or "unknown") if has_request_context() else "cli"
+
+
+def record_movement(artikel_id: int, delta: int, bestand: int, action: str) -> None:
+    if delta:
+        db.session.add(
+            Lagerbewegung(
+                artikel_id=artikel_id,
+                delta=delta,
+                bestand=bestand,
+                action=action,
+                source=movement_source(),
+            )
+        )
+
+
+def book_stock(criterion, *, action: str, delta: int = 0, absolute: int | None = None) -> Artikel | None:
+    reserve_change_version(db.session.connection())
+    if absolute is not None:
+        current = db.session.execute(select(Artikel.bestand).where(criterion).with_for_update()).scalar()
+        if current is None:
+            return None
+        delta = absolute - current
+
+    new_value = Artikel.bestand + delta if absolute is None else absolute
+    stmt = update(Artikel).where(criterion).values(bestand=new_value)
+    if current_app.config["PREVENT_NEGATIVE_STOCK"]:
+        stmt = stmt.where(new_value >= 0)
+    stmt = stmt.returning(Artikel).execution_options(populate_existing=True)
+    artikel = db.session.execute(stmt).scalars().first()
+    if artikel:
+        record_movement(artikel.id, delta, artikel.bestand, action)
+        invalidate_scanner_payload(artikel.barcode_id)
+    return artikel
+
+
+def compact_movements(before: datetime) -> int:
+    groups = (
+        db.session.query(
+            Lagerbewegung.artikel_id,
+            func.sum(Lagerbewegung.delta).label("delta"),
+            func.max(Lagerbewegung.id).label("last_id"),
+            func.max(Lagerbewegung.created_at).label("created_at"),
+        )
+        .filter(Lagerbewegung.created_at < before)
+        .group_by(Lagerbewegung.artikel_id)
+        .having(func.count(Lagerbewegung.id) > 1)
+        .subquery()
+    )
+    snapshots = db.session.execute(
+        select(groups.c.artikel_id, groups.c.delta, groups.c.last_id, groups.c.created_at, Lagerbewegung.bestand).join(
+            Lagerbewegung, Lagerbewegung.id == groups.c.last_id
+        )
+    ).all()
+    if not snapshots:
+        return 0
+
+    last_id = max(row.last_id for row in snapshots)
+    artikel_ids = [row.artikel_id for row in snapshots]
+    for start in range(0, len(artikel_ids), 1000):
+        db.session.execute(
+            Lagerbewegung.__table__.delete().where(
+                Lagerbewegung.artikel_id.in_(artikel_ids[start : start + 1000]),
+                Lagerbewegung.created_at < before,
+                Lagerbewegung.id <= last_id,
+            )
+        )
+    db.session.execute(
+        insert(Lagerbewegung),
+        [
+            {
+                "artikel_id": row.artikel_id,
+                "delta": row.delta,
+                "bestand": row.bestand,
+                "action": "snapshot",
+                "source": "compaction",
+                "created_at": row.created_at,
+            }
+            for row in snapshots
+        ],
+    )
+    db.session.commit()
+    return len(snapshots)
+
+
+class CsvLineBuffer:
+    def write(self, value: str) -> str:
+        return value
+
+
+def csv_delimiter(sep: str | None) -> str:
+    sep = (sep or "semicolon").lower()
+    return ";" if sep in ("semicolon", ";", "sc") else ","
+
+
+def csv_text_encoding(encoding: str | None) -> str:
+    return "cp1252" if (encoding or "").lower() == "cp1252" else "utf-8-sig"
+
+
+def parse_import_row(row: dict[str, str]) -> dict:
+    values: dict = {}
+    for column in IMPORT_TEXT_COLUMNS:
+        if column in row:
+            value = (row[column] or "").strip()
+            max_length = Artikel.__table__.c[column].type.length
+            if max_length and len(value) > max_length:
+                raise ValueError(f"{column} ist länger als {max_length} Zeichen.")
+            values[column] = value
+    if "name" in values and not values["name"]:
+        raise ValueError("Artikelname fehlt.")
+
+    for column in (*IMPORT_INT_COLUMNS, "id"):
+        raw_value = (row.get(column) or "").strip()
+        if column in row and (raw_value or column != "id"):
+            try:
+                values[column] = int(raw_value)
+            except ValueError:
+                raise ValueError(f"{column} muss eine ganze Zahl sein.") from None
+
+    barcode_id = (row.get("barcode_id") or "").strip().lower()
+    if barcode_id:
+        values["barcode_id"] = barcode_id
+
+    created_at = (row.get("created_at") or "").strip()
+    if created_at:
+        try:
+            values["created_at"] = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            raise ValueError("created_at muss im Format JJJJ-MM-TT hh:mm:ss sein.") from None
+    return values
+
+
+def apply_import_batch(batch: list[tuple[int, dict]], report: dict, seen: dict[str, set], dry_run: bool) -> None:
+    ids = {values["id"] for _, values in batch if "id" in values}
+    barcode_ids = {values["barcode_id"] for _, values in batch if "barcode_id" in values}
+    stock_before: dict[int, int] = {}
+    if ids:
+        stock_before.update(db.session.execute(select(Artikel.id, Artikel.bestand).where(Artikel.id.in_(ids))).all())
+    existing_ids = set(stock_before)
+    by_barcode: dict[str, int] = {}
+    if barcode_ids:
+        for row in db.session.execute(
+            select(Artikel.barcode_id, Artikel.id, Artikel.bestand).where(Artikel.barcode_id.in_(barcode_ids))
+        ):
+            by_barcode[row.barcode_id] = row.id
+            stock_before[row.id] = row.bestand
+
+    inserts: list[dict] = []
+    updates: list[dict] = []
+    for line, values in batch:
+        article_id = values.pop("id", None)
+        barcode_id = values.get("barcode_id")
+        if barcode_id and barcode_id not in by_barcode and not barcode_checksum_ok(barcode_id):
+            add_import_error(
+                report, line, "Barcode-ID hat das Format einer vergebenen ID, aber eine ungültige Prüfziffer."
+            )
+            continue
+        if article_id in existing_ids:
+            target = article_id
+            if barcode_id and by_barcode.get(barcode_id, target) != target:
+                add_import_error(report, line, "Barcode-ID gehört zu einem anderen Artikel.")
+                continue
+        else:
+            target = by_barcode.get(barcode_id)
+
+        if target is not None:
+            if target in seen["ids"]:
+                add_import_error(report, line, "Artikel kommt mehrfach in der Datei vor.")
+                continue
+            if barcode_id in seen["barcode_ids"]:
+                add_import_error(report, line, "Barcode-ID kommt mehrfach in der Datei vor.")
+                continue
+            seen["ids"].add(target)
+            updates.append({"id": target, **values})
+        elif "name" not in values:
+            add_import_error(report, line, "Artikel nicht gefunden und kein Name angegeben.")
+            continue
+        elif barcode_id in seen["barcode_ids"]:
+            add_import_error(report, line, "Barcode-ID kommt mehrfach in der Datei vor.")
+            continue
+        else:
+            inserts.append(values)
+        if barcode_id:
+            seen["barcode_ids"].add(barcode_id)
+
+    new_barcode_ids = iter(
+        generate_barcode_ids(sum(1 for values in inserts if "barcode_id" not in values), seen["barcode_ids"])
+    )
+    for values in inserts:
+        if "barcode_id" not in values:
+            values["barcode_id"] = next(new_barcode_ids)
+        for column in IMPORT_INT_COLUMNS:
+            values.setdefault(column, 0)
+        for column in IMPORT_TEXT_COLUMNS:
+            values.setdefault(column, "")
+        values.setdefault("created_at", datetime.utcnow())
+        seen["barcode_ids"].add(values["barcode_id"])
+    for values in (*inserts, *updates):
+        if "barcode_id" in values:
+            values["barcode_filename"] = f"{values['barcode_id']}.png"
+        if "name" in values:
+            values["name_normalized"] = normalize_article_name(values["name"])
+
+    report["created"] += len(inserts)
+    report["updated"] += len(updates)
+    if dry_run:
+        return
+    movements = []
+    if inserts:
+        created = db.session.execute(insert(Artikel).returning(Artikel.id, Artikel.bestand), inserts)
+        movements.extend((row.id, row.bestand, row.bestand) for row in created)
+    if updates:
+        db.session.execute(update(Artikel), updates)
+        movements.extend(
+            (values["id"], values["bestand"] - stock_before[values["id"]], values["bestand"])
+            for values in updates
+            if "bestand" in values
+        )
+    movements = [
+        {"artikel_id": artikel_id, "delta": delta, "bestand": bestand, "action": "import", "source": movement_source()}
+        for artikel_id, delta, bestand in movements
+        if delta
+    ]
+    if movements:
+        db.session.execute(insert(Lagerbewegung), movements)
+
+
+def add_import_error(report: dict, line: int, message: str) -> None:
+    report["error_count"] += 1
+    if len(report["errors"]) < 100:
+        report["errors"].append({"line": line, "message": message})
+
+
+def import_articles(lines, *, delimiter: str, dry_run: bool = False) -> dict:
+    reader = csv.DictReader(lines, delimiter=delimiter)
+    if not {"id", "barcode_id", "name"} & set(reader.fieldnames or []):
+        raise ValueError("Die Datei braucht mindestens eine der Spalten id, barcode_id oder name.")
+
+    batch_size = current_app.config["IMPORT_BATCH_SIZE"]
+    report = {"dry_run": dry_run, "rows": 0, "created": 0, "updated": 0, "error_count": 0, "errors": []}
+    seen: dict[str, set] = {"ids": set(), "barcode_ids": set()}
+    batch: list[tuple[int, dict]] = []
+    try:
+        for row in reader:
+            report["rows"] += 1
+            try:
+                batch.append((reader.line_num, parse_import_row(row)))
+            except ValueError as exc:
+                add_import_error(report, reader.line_num, str(exc))
+            if len(batch) >= batch_size:
+                apply_import_batch(batch, report, seen, dry_run)
+                batch = []
+        if batch:
+            apply_import_batch(batch, report, seen, dry_run)
+        if dry_run:
+            db.session.rollback()
+        else:
+            invalidate_scanner_payload()
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return report
+
+
 def scanner_article_payload(artikel: Artikel) -> dict[str, int | str]:
     return {
         "id": artikel.id,
@@ -341,6 +1689,606 @@ def scanner_article_payload(artikel: Artikel) -> dict[str, int | str]:
     }
 
 
+def scanner_payload_cache(tenant: str | None) -> LRUCache:
+    cache = scanner_payload_caches.get(tenant)
+    if cache is None:
+        cache = scanner_payload_caches.setdefault(tenant, LRUCache(Config.SCANNER_CACHE_SIZE))
+    return cache
+
+
+def lookup_scanner_payload(barcode_id: str) -> dict[str, int | str] | None:
+    tenant = current_tenant()
+    stamp = scanner_stamps.read(tenant, barcode_id)
+    cache = scanner_payload_cache(tenant)
+    cached = cache.get(barcode_id)
+    if cached is not None and cached[0] == stamp and cached[1] > time.monotonic():
+        metrics.inc("lager_scanner_cache_hits_total")
+        return cached[2]
+
+    metrics.inc("lager_scanner_cache_misses_total")
+    artikel = Artikel.query.filter_by(barcode_id=barcode_id).first()
+    if artikel is None:
+        return None
+    payload = scanner_article_payload(artikel)
+    if stamp is not None:
+        cache.set(barcode_id, (stamp, time.monotonic() + current_app.config["SCANNER_CACHE_TTL"], payload))
+    return payload
+
+
+def invalidate_scanner_payload(barcode_id: str | None = None) -> None:
+    pending = db.session.info.setdefault("scanner_cache_invalidations", set())
+    pending.add((current_tenant(), barcode_id))
+
+
+@event.listens_for(db.session, "after_commit")
+def apply_scanner_invalidations(session) -> None:
+    entries = session.info.pop("scanner_cache_invalidations", None)
+    if not entries:
+        return
+    for tenant, barcode_id in entries:
+        if barcode_id is None:
+            scanner_payload_cache(tenant).clear()
+        else:
+            scanner_payload_cache(tenant).pop(barcode_id)
+    try:
+        scanner_stamps.bump(entries)
+    except sqlite3.Error:
+        current_app.logger.exception("Scanner-Cache konnte nicht invalidiert werden")
+
+
+@event.listens_for(db.session, "after_rollback")
+def discard_scanner_invalidations(session) -> None:
+    session.info.pop("scanner_cache_invalidations", None)
+
+
+def apply_scanner_booking(entry) -> tuple[dict, int]:
+    client_uuid = str(entry.get("client_uuid") or "").strip()[:64]
+    if client_uuid:
+        buchung = ScannerBuchung.query.filter_by(client_uuid=client_uuid).first()
+        if buchung:
+            artikel = db.session.get(Artikel, buchung.artikel_id)
+            return {
+                "success": True,
+                "duplicate": True,
+                "message": SCANNER_ACTION_MESSAGES[buchung.action],
+                "article": scanner_article_payload(artikel) if artikel else None,
+            }, 200
+
+    if entry.get("article_id") not in (None, ""):
+        try:
+            criterion = Artikel.id == int(entry.get("article_id"))
+        except (TypeError, ValueError):
+            return {"error": "Artikel fehlt."}, 400
+    else:
+        barcode_id = normalize_scanned_barcode_id(entry.get("barcode") or entry.get("code"))
+        if not barcode_id:
+            return {"error": "Artikel fehlt."}, 400
+        criterion = Artikel.barcode_id == barcode_id
+
+    action = (entry.get("action") or "").strip().lower()
+    try:
+        amount = int(str(entry.get("amount") or "").strip())
+    except (TypeError, ValueError):
+        return {"error": "Bitte eine ganze Zahl eingeben."}, 400
+
+    if action in {"add", "remove"}:
+        if amount <= 0:
+            return {"error": "Bitte eine Menge grösser als 0 eingeben."}, 400
+        artikel = book_stock(criterion, action=action, delta=amount if action == "add" else -amount)
+    elif action == "correct":
+        if amount < 0:
+            return {"error": "Der korrigierte Bestand darf nicht negativ sein."}, 400
+        artikel = book_stock(criterion, action=action, absolute=amount)
+    else:
+        return {"error": "Unbekannte Aktion."}, 400
+
+    if not artikel:
+        if not db.session.query(Artikel.query.filter(criterion).exists()).scalar():
+            return {"error": "Artikel nicht gefunden."}, 404
+        return {"error": "Der Bestand darf nicht negativ werden."}, 409
+
+    if client_uuid:
+        db.session.add(
+            ScannerBuchung(client_uuid=client_uuid, artikel_id=artikel.id, action=action, amount=amount)
+        )
+
+    return {
+        "success": True,
+        "message": SCANNER_ACTION_MESSAGES[action],
+        "article": scanner_article_payload(artikel),
+    }, 200
+
+
+def commit_scanner_booking(result: dict, status: int) -> tuple[dict, int]:
+    if status != 200:
+        db.session.rollback()
+        return result, status
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return {"error": "Buchung wurde bereits übermittelt, bitte erneut senden."}, 409
+    return result, status
+
+
+def parse_api_fields(value: str | None) -> tuple[str, ...] | None:
+    if not value:
+        return None
+    fields = tuple(dict.fromkeys(field.strip() for field in value.split(",") if field.strip()))
+    unknown = [field for field in fields if field not in API_ARTICLE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unbekannte Felder: {', '.join(unknown)}")
+    return fields
+
+
+def api_article_payload(artikel: Artikel, fields: tuple[str, ...] | None = None) -> dict:
+    payload = {
+        **scanner_article_payload(artikel),
+        "bestelllink": artikel.bestelllink or "",
+        "hinweis": artikel.hinweis or "",
+        "created_at": artikel.created_at.isoformat() if artikel.created_at else None,
+        "updated_at": artikel.updated_at.isoformat() if artikel.updated_at else None,
+        "version": artikel.version,
+    }
+    if fields is None:
+        return payload
+    return {field: payload[field] for field in fields}
+
+
+def query_changes(after: tuple | None, limit: int, fields: tuple[str, ...] | None = None) -> tuple[list[dict], tuple, bool]:
+    position = after or (-1, 0)
+    upserts = Artikel.query.filter(tuple_(Artikel.version, Artikel.id) > position)
+    deletions = ArtikelLoeschung.query.filter(
+        tuple_(ArtikelLoeschung.version, ArtikelLoeschung.artikel_id) > position
+    )
+    high_water_mark = committed_change_version(db.session.connection())
+    if high_water_mark is not None:
+        upserts = upserts.filter(Artikel.version < high_water_mark)
+        deletions = deletions.filter(ArtikelLoeschung.version < high_water_mark)
+    upserts = upserts.order_by(Artikel.version, Artikel.id).limit(limit + 1).all()
+    deletions = deletions.order_by(ArtikelLoeschung.version, ArtikelLoeschung.artikel_id).limit(limit + 1).all()
+    merged = sorted(
+        [(row.version, row.artikel_id, 0, row) for row in deletions] + [(row.version, row.id, 1, row) for row in upserts],
+        key=lambda item: item[:3],
+    )
+    has_more = len(merged) > limit
+    changes = []
+    for version, artikel_id, _, row in merged[:limit]:
+        if isinstance(row, Artikel):
+            changes.append({"type": "upsert", "version": version, "id": artikel_id, "data": api_article_payload(row, fields)})
+        else:
+            changes.append(
+                {
+                    "type": "delete",
+                    "version": version,
+                    "id": artikel_id,
+                    "barcode_id": row.barcode_id,
+                    "deleted_at": row.deleted_at.isoformat(),
+                }
+            )
+        position = (version, artikel_id)
+    return changes, position, has_more
+
+
+def api_json_response(payload: dict) -> Response:
+    response = jsonify(payload)
+    response.add_etag()
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def upgrade_tenants() -> list[str | None]:
+    tenants = list(current_app.config["TENANTS"]) or [current_app.config["TENANT"]]
+    for tenant in tenants:
+        with current_app.app_context():
+            g.tenant = tenant
+            upgrade()
+            align_change_version(db.session.connection())
+            db.session.commit()
+    return tenants
+
+
+EXPORT_COLUMNS = (
+    ("id", lambda a: a.id),
+    ("name", lambda a: a.name or ""),
+    ("bestand", lambda a: a.bestand),
+    ("mindestbestand", lambda a: a.mindestbestand),
+    ("lagerplatz", lambda a: a.lagerplatz or ""),
+    ("bestelllink", lambda a: a.bestelllink or ""),
+    ("hinweis", lambda a: (a.hinweis or "").replace("\n", " ").strip()),
+    ("barcode_id", lambda a: a.barcode_id),
+    ("barcode_filename", lambda a: a.barcode_filename or ""),
+    ("created_at", lambda a: a.created_at.strftime("%Y-%m-%d %H:%M:%S") if a.created_at else ""),
+)
+
+
+def export_csv_options(args) -> tuple[str, str, str, bool]:
+    delimiter = csv_delimiter(args.get("sep"))
+    encoding = (args.get("encoding", "utf-8") or "utf-8").lower()
+    add_bom = (args.get("bom", "1") in ("1", "true", "yes")) if encoding.startswith("utf") else False
+    if encoding == "cp1252":
+        return delimiter, "cp1252", "text/csv; charset=windows-1252", add_bom
+    return delimiter, "utf-8", "text/csv; charset=utf-8", add_bom
+
+
+def iter_export_csv(delimiter: str, charset: str, add_bom: bool):
+    batch_size = current_app.config["EXPORT_BATCH_SIZE"]
+    writer = csv.writer(CsvLineBuffer(), delimiter=delimiter, quoting=csv.QUOTE_MINIMAL)
+    chunk = ["\ufeff"] if add_bom and charset == "utf-8" else []
+    chunk.append(writer.writerow([column for column, _ in EXPORT_COLUMNS]))
+
+    artikel = Artikel.query.order_by(Artikel.name.asc(), Artikel.id.asc())
+    for item in artikel.yield_per(batch_size):
+        chunk.append(writer.writerow([value(item) for _, value in EXPORT_COLUMNS]))
+        if len(chunk) >= batch_size:
+            yield "".join(chunk).encode(charset, errors="replace")
+            chunk = []
+    if chunk:
+        yield "".join(chunk).encode(charset, errors="replace")
+
+
+def collect_label_items(args) -> list[tuple[str, str]]:
+    artikel, _ = query_barcodes(build_barcode_filters(args))
+    selected_ids = {value for value in (args.get("ids") or "").split(",") if value.strip().isdigit()}
+    if selected_ids:
+        artikel = [art for art in artikel if str(art.id) in selected_ids]
+    try:
+        copies = min(max(int(args.get("copies", "1")), 1), 100)
+    except ValueError:
+        copies = 1
+    return [(art.name, art.barcode_id) for art in artikel for _ in range(copies)]
+
+
+job_handlers: dict = {}
+
+
+def job_handler(kind: str):
+    def register(func):
+        job_handlers[kind] = func
+        return func
+
+    return register
+
+
+def enqueue_job(kind: str, payload: dict | None = None) -> Job:
+    job = Job(kind=kind, payload=json.dumps(payload or {}, ensure_ascii=False))
+    db.session.add(job)
+    db.session.flush()
+    db.session.info["jobs_enqueued"] = True
+    return job
+
+
+@event.listens_for(db.session, "after_commit")
+def wake_job_worker(session) -> None:
+    if session.info.pop("jobs_enqueued", False) and has_app_context():
+        worker = current_app.extensions.get("job_worker")
+        if worker is not None:
+            worker.start()
+            worker.wake()
+
+
+@event.listens_for(db.session, "after_rollback")
+def discard_enqueued_jobs(session) -> None:
+    session.info.pop("jobs_enqueued", None)
+
+
+def claim_job() -> Job | None:
+    if db.session.execute(select(Job.id).where(Job.status == "queued").limit(1)).first() is None:
+        db.session.rollback()
+        return None
+    candidate = (
+        select(Job.id)
+        .where(Job.status == "queued")
+        .order_by(Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    now = datetime.utcnow()
+    stmt = (
+        update(Job)
+        .where(Job.id == candidate, Job.status == "queued")
+        .values(status="running", attempts=Job.attempts + 1, started_at=now, heartbeat_at=now)
+        .returning(Job)
+        .execution_options(populate_existing=True)
+    )
+    job = db.session.execute(stmt).scalars().first()
+    db.session.commit()
+    return job
+
+
+def job_output_path(job_id: int, filename: str) -> Path:
+    directory = Path(current_app.config["JOB_OUTPUT_DIR"]) / (current_tenant() or "")
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f"{job_id}-{filename}"
+
+
+@contextmanager
+def job_output_file(job_id: int, filename: str):
+    path = job_output_path(job_id, filename)
+    partial = path.with_name(f".{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    try:
+        with open(partial, "wb") as handle:
+            yield handle
+        os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
+
+
+def run_job(job: Job) -> None:
+    job_id, kind, attempts, payload = job.id, job.kind, job.attempts, json.loads(job.payload or "{}")
+    try:
+        handler = job_handlers.get(kind)
+        if handler is None:
+            raise ValueError(f"Unbekannter Auftragstyp: {kind}")
+        result = handler(job_id, payload)
+    except Exception as exc:
+        db.session.rollback()
+        current_app.logger.exception("Auftrag %s (%s) fehlgeschlagen", job_id, kind)
+        values = {"status": "failed", "error": str(exc)[:1000]}
+    else:
+        values = {"status": "done", "result": json.dumps(result, ensure_ascii=False)}
+    finished = db.session.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == "running", Job.attempts == attempts)
+        .values(finished_at=datetime.utcnow(), **values)
+    )
+    db.session.commit()
+    if not finished.rowcount:
+        current_app.logger.warning("Auftrag %s wurde inzwischen neu vergeben, Ergebnis verworfen", job_id)
+        return
+    metrics.inc("lager_jobs_total", kind=kind, status=values["status"])
+
+
+def maintain_jobs() -> None:
+    now = datetime.utcnow()
+    stale = (
+        Job.status == "running",
+        func.coalesce(Job.heartbeat_at, Job.started_at) < now - timedelta(seconds=current_app.config["JOB_TIMEOUT"]),
+    )
+    max_attempts = current_app.config["JOB_MAX_ATTEMPTS"]
+    db.session.execute(update(Job).where(*stale, Job.attempts < max_attempts).values(status="queued"))
+    db.session.execute(
+        update(Job)
+        .where(*stale, Job.attempts >= max_attempts)
+        .values(status="failed", error="Zeitüberschreitung", finished_at=now)
+    )
+
+    cutoff = now - timedelta(days=current_app.config["JOB_RETENTION_DAYS"])
+    expired = db.session.execute(
+        select(Job.id, Job.result).where(Job.status.in_(("done", "failed")), Job.finished_at < cutoff)
+    ).all()
+    for job_id, result in expired:
+        filename = json.loads(result or "{}").get("file")
+        if filename:
+            job_output_path(job_id, filename).unlink(missing_ok=True)
+    if expired:
+        db.session.execute(Job.__table__.delete().where(Job.id.in_([job_id for job_id, _ in expired])))
+    db.session.commit()
+
+
+class JobWorker:
+    def __init__(self, app: Flask, threads: int) -> None:
+        self.app = app
+        self.threads = threads
+        self._threads: list[threading.Thread] = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._maintained_at = 0.0
+        self._held: set[tuple[str | None, int]] = set()
+
+    def start(self, burst: bool = False) -> None:
+        if self._threads or self.threads < 1:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.threads):
+                thread = threading.Thread(target=self.run, args=(burst,), name=f"job-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            threading.Thread(target=self.beat, name="job-heartbeat", daemon=True).start()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def join(self) -> None:
+        deadline = None
+        while any(thread.is_alive() for thread in self._threads):
+            if self._stop.is_set():
+                deadline = deadline or time.monotonic() + self.app.config["JOB_SHUTDOWN_TIMEOUT"]
+                if time.monotonic() > deadline:
+                    return
+            for thread in self._threads:
+                thread.join(0.5)
+
+    def shutdown(self) -> None:
+        self.stop()
+        self.join()
+        self.release()
+
+    def reset(self) -> None:
+        self._threads = []
+        self._lock = threading.Lock()
+        self._held = set()
+
+    def held_by_tenant(self) -> dict[str | None, list[int]]:
+        held = defaultdict(list)
+        for tenant, job_id in list(self._held):
+            held[tenant].append(job_id)
+        return held
+
+    def beat(self) -> None:
+        while not self._stop.wait(self.app.config["JOB_HEARTBEAT_INTERVAL"]):
+            try:
+                for tenant, job_ids in self.held_by_tenant().items():
+                    with self.app.app_context():
+                        g.tenant = tenant
+                        db.session.execute(
+                            update(Job)
+                            .where(Job.id.in_(job_ids), Job.status == "running")
+                            .values(heartbeat_at=datetime.utcnow())
+                        )
+                        db.session.commit()
+            except Exception:
+                self.app.logger.exception("Auftrags-Heartbeat fehlgeschlagen")
+
+    def release(self) -> None:
+        for tenant, job_ids in self.held_by_tenant().items():
+            with self.app.app_context():
+                g.tenant = tenant
+                db.session.execute(
+                    update(Job)
+                    .where(Job.id.in_(job_ids), Job.status == "running")
+                    .values(status="queued", heartbeat_at=None)
+                )
+                db.session.commit()
+            self.app.logger.warning("Aufträge %s beim Beenden freigegeben", job_ids)
+
+    def tenants(self) -> list[str | None]:
+        return list(self.app.config["TENANTS"]) or [self.app.config["TENANT"]]
+
+    def run_once(self) -> bool:
+        maintain = time.monotonic() - self._maintained_at > self.app.config["JOB_MAINTENANCE_INTERVAL"]
+        if maintain:
+            self._maintained_at = time.monotonic()
+        worked = False
+        for tenant in self.tenants():
+            with self.app.app_context():
+                g.tenant = tenant
+                if maintain:
+                    maintain_jobs()
+                job = claim_job()
+                if job is not None:
+                    self._held.add((tenant, job.id))
+                    try:
+                        run_job(job)
+                    finally:
+                        self._held.discard((tenant, job.id))
+                    worked = True
+        return worked
+
+    def run(self, burst: bool = False) -> None:
+        while not self._stop.is_set():
+            try:
+                worked = self.run_once()
+            except Exception:
+                self.app.logger.exception("Auftragsverarbeitung fehlgeschlagen")
+                worked = False
+            if worked:
+                continue
+            if burst:
+                return
+            self._wake.wait(self.app.config["JOB_POLL_INTERVAL"])
+            self._wake.clear()
+
+
+def job_status_payload(job: Job) -> dict:
+    result = json.loads(job.result) if job.result else None
+    links = {"self": url_for("job_status", id=job.id)}
+    if job.status == "done" and result and result.get("file"):
+        links["download"] = url_for("job_download", id=job.id)
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "attempts": job.attempts,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "heartbeat_at": job.heartbeat_at.isoformat() if job.heartbeat_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "error": job.error,
+        "result": result,
+        "links": links,
+    }
+
+
+def job_accepted_response(job: Job) -> Response:
+    response = jsonify(job_status_payload(job))
+    response.status_code = 202
+    response.headers["Location"] = url_for("job_status", id=job.id)
+    return response
+
+
+@job_handler("export_csv")
+def export_csv_handler(job_id: int, payload: dict) -> dict:
+    delimiter, charset, content_type, add_bom = export_csv_options(payload)
+    with job_output_file(job_id, "artikel_export.csv") as handle:
+        for chunk in iter_export_csv(delimiter, charset, add_bom):
+            handle.write(chunk)
+        size = handle.tell()
+    return {"file": "artikel_export.csv", "mimetype": content_type, "bytes": size}
+
+
+@job_handler("label_sheet")
+def label_sheet_handler(job_id: int, payload: dict) -> dict:
+    items = collect_label_items(payload)
+    if not items:
+        raise ValueError("Keine Artikel für diesen Filter gefunden.")
+    with job_output_file(job_id, "etiketten.pdf") as handle:
+        for chunk in stream_label_pdf(iter_label_pages(items, current_app.config["LABEL_SHEET_WORKERS"])):
+            handle.write(chunk)
+    return {"file": "etiketten.pdf", "mimetype": "application/pdf", "labels": len(items)}
+
+
+@job_handler("delete_barcode_file")
+def delete_barcode_file_handler(job_id: int, payload: dict) -> dict:
+    path = Path(current_app.config["UPLOAD_FOLDER"]) / Path(payload["filename"]).name
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        return {"deleted": False}
+    return {"deleted": True}
+
+
+def install_metrics(app: Flask) -> None:
+    metrics.enabled = True
+
+    @app.before_request
+    def start_request_timer() -> None:
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response: Response) -> Response:
+        started = g.pop("metrics_started", None)
+        if started is not None:
+            endpoint = request.endpoint or "unmatched"
+            metrics.observe_request(endpoint, request.method, time.perf_counter() - started)
+            metrics.inc(
+                "lager_http_requests_total",
+                endpoint=endpoint,
+                method=request.method,
+                status=str(response.status_code),
+            )
+        return response
+
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context.metrics_query_started = time.perf_counter()
+
+    def record_query_metrics(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "metrics_query_started", None)
+        if started is None:
+            return
+        duration = time.perf_counter() - started
+        endpoint = (request.endpoint or "unmatched") if has_request_context() else "none"
+        metrics.inc("lager_sql_queries_total", endpoint=endpoint)
+        metrics.inc("lager_sql_query_duration_seconds_total", duration, endpoint=endpoint)
+
+    for engine in db.engines.values():
+        event.listen(engine, "before_cursor_execute", start_query_timer)
+        event.listen(engine, "after_cursor_execute", record_query_metrics)
+
+    @app.route("/metrics")
+    def prometheus_metrics():
+        return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
 def create_app() -> Flask:
     app = Flask(__name__)
     app.config.from_object(Config)
@@ -349,7 +2297,35 @@ def create_app() -> Flask:
     Path(app.config["UPLOAD_FOLDER"]).mkdir(parents=True, exist_ok=True)
 
     db.init_app(app)
-    migrate.init_app(app, db, directory=str(BASE_DIR / "migrations"))
+    migrate.init_app(app, db, directory=str(BASE_DIR / "migrations"), include_object=include_schema_object)
+
+    job_worker = JobWorker(app, app.config["JOB_WORKER_THREADS"])
+    app.extensions["job_worker"] = job_worker
+    os.register_at_fork(after_in_child=job_worker.reset)
+    atexit.register(job_worker.shutdown)
+
+    @app.before_request
+    def start_job_worker() -> None:
+        job_worker.start()
+
+    tenant_hosts = {host: key for key, tenant in app.config["TENANTS"].items() for host in tenant["HOSTS"]}
+    if app.config["TENANTS"]:
+        app.wsgi_app = TenantPathMiddleware(app.wsgi_app, app.config["TENANTS"])
+
+    @app.before_request
+    def select_tenant() -> None:
+        if not app.config["TENANTS"]:
+            return
+        tenant = (
+            request.environ.get("lager.tenant")
+            or tenant_hosts.get(request.host.partition(":")[0].lower())
+            or app.config["TENANT"]
+        )
+        if tenant is None:
+            if request.endpoint in {"healthz", "prometheus_metrics", "static"}:
+                return
+            abort(404)
+        g.tenant = tenant
 
     @app.template_filter("datetime_display")
     def datetime_display(value: datetime | None) -> str:
@@ -360,31 +2336,39 @@ def create_app() -> Flask:
     @app.context_processor
     def inject_layout_context() -> dict[str, object]:
         return {
-            "app_title": app.config["APP_TITLE"],
-            "company_name": app.config["COMPANY_NAME"],
-            "SCANNER_ENABLED": app.config["SCANNER_ENABLED"],
+            "app_title": tenant_setting("APP_TITLE"),
+            "company_name": tenant_setting("COMPANY_NAME"),
+            "SCANNER_ENABLED": tenant_setting("SCANNER_ENABLED"),
+            "article_index_url": article_index_url,
         }
 
     @app.route("/")
     def index():
-        artikel = Artikel.query.order_by(Artikel.name.asc(), Artikel.id.asc()).all()
-        for item in artikel:
-            ensure_barcode_image(item.barcode_id)
-
-        summary = {
-            "total": len(artikel),
-            "critical": sum(1 for item in artikel if item.bestand < item.mindestbestand),
-            "low": sum(1 for item in artikel if item.bestand == item.mindestbestand),
-        }
-        duplicate_groups = build_duplicate_groups()
+        filters = build_index_filters(request.args)
+        artikel, next_cursor, match_count = query_inventory(filters)
+        aggregates = read_inventory_aggregates()
         return render_template(
             "index.html",
             artikel=artikel,
-            summary=summary,
-            duplicate_group_count=len(duplicate_groups),
-            duplicate_article_count=sum(group["count"] for group in duplicate_groups),
+            filters=filters,
+            next_cursor=next_cursor,
+            match_count=match_count,
+            status_options=INDEX_STATUS_OPTIONS,
+            sort_options=INDEX_SORT_OPTIONS,
+            summary=aggregates,
+            duplicate_group_count=aggregates["duplicate_groups"],
+            duplicate_article_count=aggregates["duplicate_articles"],
         )
 
+    @app.route("/search.json")
+    def search_json():
+        query = compact_whitespace(request.args.get("q"))
+        try:
+            limit = min(max(int(request.args.get("limit") or 10), 1), 50)
+        except ValueError:
+            limit = 10
+        return jsonify({"query": query, "results": search_articles(query, limit)})
+
     @app.route("/add", methods=["GET", "POST"])
     def add():
         form_data = build_article_form_data()
@@ -410,8 +2394,7 @@ def create_app() -> Flask:
                 except ValueError:
                     flash("Bitte trage Bestand und Mindestbestand als ganze Zahlen ein.", "error")
                 else:
-                    barcode_id = str(uuid.uuid4())[:8]
-                    ensure_barcode_image(barcode_id)
+                    barcode_id = generate_barcode_id()
 
                     artikel = Artikel(
                         name=payload["name"],
@@ -421,13 +2404,16 @@ def create_app() -> Flask:
                         bestelllink=payload["bestelllink"],
                         hinweis=payload["hinweis"],
                         barcode_filename=f"{barcode_id}.png",
+                        barcode_id=barcode_id,
                     )
                     db.session.add(artikel)
+                    db.session.flush()
+                    record_movement(artikel.id, artikel.bestand, artikel.bestand, "create")
                     db.session.commit()
                     flash("Artikel wurde gespeichert.", "success")
                     if duplicate_matches:
                         flash("Artikel wurde trotz möglicher Dublette übernommen.", "warning")
-                    return redirect(url_for("index") + f"#art-{artikel.id}")
+                    return redirect(article_index_url(artikel))
 
         return render_template(
             "add.html",
@@ -463,17 +2449,19 @@ def create_app() -> Flask:
                 except ValueError:
                     flash("Bitte trage Bestand und Mindestbestand als ganze Zahlen ein.", "error")
                 else:
+                    record_movement(artikel.id, payload["bestand"] - artikel.bestand, payload["bestand"], "edit")
                     artikel.name = payload["name"]
                     artikel.bestand = payload["bestand"]
                     artikel.mindestbestand = payload["mindestbestand"]
                     artikel.lagerplatz = payload["lagerplatz"]
                     artikel.bestelllink = payload["bestelllink"]
                     artikel.hinweis = payload["hinweis"]
+                    invalidate_scanner_payload(artikel.barcode_id)
                     db.session.commit()
                     flash("Artikel wurde aktualisiert.", "success")
                     if duplicate_matches:
                         flash("Die Änderung wurde trotz möglicher Dublette gespeichert.", "warning")
-                    return redirect(url_for("index") + f"#art-{artikel.id}")
+                    return redirect(article_index_url(artikel))
 
         return render_template(
             "edit.html",
@@ -485,29 +2473,75 @@ def create_app() -> Flask:
 
     @app.route("/update/<int:id>", methods=["GET", "POST"])
     def update(id: int):
-        artikel = Artikel.query.get_or_404(id)
         if request.method == "POST":
             try:
                 delta = int((request.form.get("delta") or "").strip())
             except ValueError:
                 flash("Bitte trage eine ganze Zahl ein, z. B. 5 oder -2.", "error")
             else:
-                artikel.bestand += delta
-                db.session.commit()
-                flash("Bestand wurde angepasst.", "success")
-                return redirect(url_for("index") + f"#art-{artikel.id}")
-        return render_template("update.html", artikel=artikel)
+                artikel = book_stock(Artikel.id == id, action="add" if delta >= 0 else "remove", delta=delta)
+                if artikel:
+                    db.session.commit()
+                    flash("Bestand wurde angepasst.", "success")
+                    return redirect(article_index_url(artikel))
+                db.session.rollback()
+                Artikel.query.get_or_404(id)
+                flash("Der Bestand darf nicht negativ werden.", "error")
+        artikel = Artikel.query.get_or_404(id)
+        bewegungen = (
+            Lagerbewegung.query.filter_by(artikel_id=artikel.id)
+            .order_by(Lagerbewegung.created_at.desc(), Lagerbewegung.id.desc())
+            .limit(10)
+            .all()
+        )
+        return render_template("update.html", artikel=artikel, bewegungen=bewegungen)
+
+    @app.route("/bewegungen/<int:id>")
+    def movements(id: int):
+        artikel = Artikel.query.get_or_404(id)
+        try:
+            limit = min(max(int(request.args.get("limit") or 50), 1), 500)
+            before_id = int(request.args.get("before") or 0)
+        except ValueError:
+            return jsonify({"error": "Ungültige Anfrage."}), 400
+
+        query = Lagerbewegung.query.filter_by(artikel_id=artikel.id)
+        before = db.session.get(Lagerbewegung, before_id) if before_id else None
+        if before:
+            query = query.filter(
+                tuple_(Lagerbewegung.created_at, Lagerbewegung.id) < tuple_(before.created_at, before.id)
+            )
+        bewegungen = (
+            query.order_by(Lagerbewegung.created_at.desc(), Lagerbewegung.id.desc()).limit(limit).all()
+        )
+        return jsonify(
+            {
+                "artikel_id": artikel.id,
+                "bestand": artikel.bestand,
+                "movements": [
+                    {
+                        "id": bewegung.id,
+                        "delta": bewegung.delta,
+                        "bestand": bewegung.bestand,
+                        "action": bewegung.action,
+                        "source": bewegung.source,
+                        "created_at": bewegung.created_at.isoformat(),
+                    }
+                    for bewegung in bewegungen
+                ],
+                "next_before": bewegungen[-1].id if len(bewegungen) == limit else None,
+            }
+        )
 
     @app.route("/delete/<int:id>", methods=["POST"])
     def delete(id: int):
         artikel = Artikel.query.get_or_404(id)
-        barcode_path = Path(app.config["UPLOAD_FOLDER"]) / artikel.barcode_filename
-        if barcode_path.exists():
-            try:
-                barcode_path.unlink()
-            except OSError:
-                pass
+        if (Path(app.config["UPLOAD_FOLDER"]) / artikel.barcode_filename).exists():
+            enqueue_job("delete_barcode_file", {"filename": artikel.barcode_filename})
 
+        record_movement(artikel.id, -artikel.bestand, 0, "delete")
+        invalidate_scanner_payload(artikel.barcode_id)
+        db.session.add(ArtikelLoeschung(artikel_id=artikel.id, barcode_id=artikel.barcode_id))
         db.session.delete(artikel)
         db.session.commit()
         flash("Artikel wurde gelöscht.", "success")
@@ -519,28 +2553,28 @@ def create_app() -> Flask:
 
     @app.route("/scanner")
     def scanner():
-        if not app.config["SCANNER_ENABLED"]:
+        if not tenant_setting("SCANNER_ENABLED"):
             abort(404)
         return render_template("scanner.html")
 
     @app.route("/scanner/lookup", methods=["POST"])
     def scanner_lookup():
-        if not app.config["SCANNER_ENABLED"]:
+        if not tenant_setting("SCANNER_ENABLED"):
             return jsonify({"error": "Scanner ist deaktiviert."}), 404
 
         payload = request.get_json(silent=True) or request.form
         raw_code = payload.get("code") if payload else ""
         barcode_id = normalize_scanned_barcode_id(raw_code)
-
-        artikel = None
-        if barcode_id:
-            artikel = Artikel.query.filter(Artikel.barcode_filename == f"{barcode_id}.png").first()
-
-        if not artikel:
+        article = lookup_scanner_payload(barcode_id) if barcode_id else None
+        if not article:
             return jsonify(
                 {
                     "found": False,
-                    "message": "Artikel nicht gefunden",
+                    "message": (
+                        "Artikel nicht gefunden"
+                        if barcode_checksum_ok(barcode_id)
+                        else "Prüfziffer ungültig – bitte erneut scannen"
+                    ),
                     "barcode_id": barcode_id,
                 }
             )
@@ -548,67 +2582,131 @@ def create_app() -> Flask:
         return jsonify(
             {
                 "found": True,
-                "article": scanner_article_payload(artikel),
+                "article": article,
             }
         )
 
     @app.route("/scanner/adjust", methods=["POST"])
     def scanner_adjust():
-        if not app.config["SCANNER_ENABLED"]:
+        if not tenant_setting("SCANNER_ENABLED"):
             return jsonify({"error": "Scanner ist deaktiviert."}), 404
 
         payload = request.get_json(silent=True) or request.form
         if not payload:
             return jsonify({"error": "Ungültige Anfrage."}), 400
 
+        result, status = commit_scanner_booking(*apply_scanner_booking(payload))
+        return jsonify(result), status
+
+    @app.route("/scanner/adjust/batch", methods=["POST"])
+    def scanner_adjust_batch():
+        if not tenant_setting("SCANNER_ENABLED"):
+            return jsonify({"error": "Scanner ist deaktiviert."}), 404
+
+        payload = request.get_json(silent=True)
+        entries = payload.get("entries") if isinstance(payload, dict) else payload
+        if not isinstance(entries, list) or not entries:
+            return jsonify({"error": "Ungültige Anfrage."}), 400
+        if len(entries) > app.config["SCANNER_BATCH_LIMIT"]:
+            return jsonify({"error": f"Maximal {app.config['SCANNER_BATCH_LIMIT']} Buchungen pro Anfrage."}), 413
+
+        results = []
+        for index, entry in enumerate(entries):
+            if isinstance(entry, dict):
+                result, status = apply_scanner_booking(entry)
+            else:
+                entry = {}
+                result, status = {"error": "Ungültige Buchung."}, 400
+            results.append(
+                {
+                    "index": index,
+                    "client_uuid": entry.get("client_uuid"),
+                    "status": status,
+                    **result,
+                }
+            )
+
         try:
-            article_id = int(payload.get("article_id") or "")
-        except (TypeError, ValueError):
-            return jsonify({"error": "Artikel fehlt."}), 400
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"error": "Buchungen wurden parallel übermittelt, bitte erneut senden."}), 409
+        return jsonify({"success": True, "results": results})
 
-        action = (payload.get("action") or "").strip().lower()
+    @app.route("/api/v1/artikel")
+    def api_artikel_list():
         try:
-            amount = int(str(payload.get("amount") or "").strip())
-        except (TypeError, ValueError):
-            return jsonify({"error": "Bitte eine ganze Zahl eingeben."}), 400
+            fields = parse_api_fields(request.args.get("fields"))
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+
+        filters = build_index_filters(request.args)
+        artikel, next_cursor, match_count = query_inventory(filters)
+        next_url = None
+        if next_cursor:
+            next_url = url_for("api_artikel_list", **{**request.args.to_dict(), "after": next_cursor})
+        return api_json_response(
+            {
+                "data": [api_article_payload(item, fields) for item in artikel],
+                "total": match_count,
+                "next": next_cursor,
+                "links": {"next": next_url},
+            }
+        )
 
-        artikel = Artikel.query.get(article_id)
-        if not artikel:
-            return jsonify({"error": "Artikel nicht gefunden."}), 404
+    @app.route("/api/v1/artikel/<int:id>")
+    def api_artikel_detail(id: int):
+        try:
+            fields = parse_api_fields(request.args.get("fields"))
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
 
-        if action in {"add", "remove"}:
-            if amount <= 0:
-                return jsonify({"error": "Bitte eine Menge grösser als 0 eingeben."}), 400
-            if action == "add":
-                artikel.bestand += amount
-                message = "Artikel wurde hinzugefügt."
-            else:
-                artikel.bestand -= amount
-                message = "Artikel wurde entnommen."
-        elif action == "correct":
-            if amount < 0:
-                return jsonify({"error": "Der korrigierte Bestand darf nicht negativ sein."}), 400
-            artikel.bestand = amount
-            message = "Bestand wurde korrigiert."
-        else:
-            return jsonify({"error": "Unbekannte Aktion."}), 400
+        artikel = db.session.get(Artikel, id)
+        if artikel is None:
+            return jsonify({"error": "Artikel nicht gefunden."}), 404
+        return api_json_response({"data": api_article_payload(artikel, fields)})
 
-        db.session.commit()
-        return jsonify(
+    @app.route("/changes")
+    @app.route("/api/v1/changes")
+    def api_changes():
+        try:
+            fields = parse_api_fields(request.args.get("fields"))
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+
+        since = request.args.get("since")
+        after = decode_cursor(since)
+        if since and after is None:
+            return jsonify({"error": "Ungültiger Cursor."}), 400
+        limit = min(max(request.args.get("limit", CHANGES_PAGE_SIZE, type=int), 1), CHANGES_MAX_PAGE_SIZE)
+
+        changes, position, has_more = query_changes(after, limit, fields)
+        next_cursor = encode_cursor(*position)
+        return api_json_response(
             {
-                "success": True,
-                "message": message,
-                "article": scanner_article_payload(artikel),
+                "data": changes,
+                "next": next_cursor,
+                "has_more": has_more,
+                "links": {"next": url_for(request.endpoint, **{**request.args.to_dict(), "since": next_cursor})},
             }
         )
 
+    @app.route("/api/v1/artikel/<int:id>/buchungen", methods=["POST"])
+    def api_artikel_booking(id: int):
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return jsonify({"error": "Ungültige Anfrage."}), 400
+
+        result, status = commit_scanner_booking(*apply_scanner_booking({**payload, "article_id": id}))
+        return jsonify(result), status
+
     @app.route("/healthz")
     def healthz():
         return "ok", 200
 
     @app.route("/adjust_barcode/<barcode_id>", methods=["GET", "POST"])
     def adjust_barcode(barcode_id: str):
-        artikel = Artikel.query.filter(Artikel.barcode_filename == f"{barcode_id}.png").first()
+        artikel = Artikel.query.filter_by(barcode_id=barcode_id).first()
         if not artikel:
             return "Artikel nicht gefunden", 404
 
@@ -620,17 +2718,43 @@ def create_app() -> Flask:
                 return render_template("adjust.html", artikel=artikel)
 
             aktion = request.form.get("aktion")
-            if aktion == "hinzufügen":
-                artikel.bestand += menge
-            elif aktion == "entnehmen":
-                artikel.bestand -= menge
+            if aktion in {"hinzufügen", "entnehmen"}:
+                delta = menge if aktion == "hinzufügen" else -menge
+                action = "add" if aktion == "hinzufügen" else "remove"
+                if not book_stock(Artikel.id == artikel.id, action=action, delta=delta):
+                    db.session.rollback()
+                    flash("Der Bestand darf nicht negativ werden.", "error")
+                    return render_template("adjust.html", artikel=artikel)
+                db.session.commit()
 
-            db.session.commit()
             flash("Bestand wurde über den Barcode angepasst.", "success")
-            return redirect(url_for("index") + f"#art-{artikel.id}")
+            return redirect(article_index_url(artikel))
 
         return render_template("adjust.html", artikel=artikel)
 
+    @app.route("/qr/<barcode_id>.svg", defaults={"fmt": "svg"})
+    @app.route("/qr/<barcode_id>.png", defaults={"fmt": "png"})
+    def barcode_image(barcode_id: str, fmt: str):
+        size = request.args.get("size", "screen")
+        if size not in QR_SIZE_PRESETS:
+            abort(400)
+        if len(barcode_id) > BARCODE_ID_MAX_LENGTH or WHITESPACE_RE.search(barcode_id):
+            abort(404)
+        if barcode_image_cache.get((barcode_id, fmt, size)) is None and not db.session.query(
+            Artikel.query.filter_by(barcode_id=barcode_id).exists()
+        ).scalar():
+            abort(404)
+        try:
+            data, etag = render_barcode_image(barcode_id, fmt, size)
+        except (DataOverflowError, ValueError):
+            abort(404)
+        response = Response(data, mimetype=QR_MIMETYPES[fmt])
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = app.config["QR_CACHE_MAX_AGE"]
+        response.cache_control.immutable = True
+        return response.make_conditional(request)
+
     @app.route("/barcodes")
     def barcodes():
         filters = build_barcode_filters(request.args)
@@ -643,6 +2767,60 @@ def create_app() -> Flask:
             active_label=active_label,
         )
 
+    @app.route("/barcodes/sheet.<fmt>")
+    def barcode_sheet(fmt: str):
+        if fmt not in ("pdf", "png"):
+            abort(404)
+
+        items = collect_label_items(request.args)
+        if not items:
+            return jsonify({"error": "Keine Artikel für diesen Filter gefunden."}), 404
+        if len(items) > app.config["LABEL_SHEET_LIMIT"]:
+            return jsonify({"error": f"Maximal {app.config['LABEL_SHEET_LIMIT']} Etiketten pro Datei."}), 400
+
+        if fmt == "png":
+            try:
+                page_number = max(int(request.args.get("page", "1")), 1)
+            except ValueError:
+                page_number = 1
+            chunks = chunk_label_items(items)
+            if page_number > len(chunks):
+                abort(404)
+            buffer = io.BytesIO()
+            render_label_page(chunks[page_number - 1]).save(buffer, format="PNG", dpi=(LABEL_SHEET_DPI, LABEL_SHEET_DPI))
+            response = Response(buffer.getvalue(), mimetype="image/png")
+            response.headers["Content-Disposition"] = f"inline; filename=etiketten-{page_number}.png"
+            return response
+
+        pages = iter_label_pages(items, app.config["LABEL_SHEET_WORKERS"])
+        response = Response(stream_with_context(stream_label_pdf(pages)), mimetype="application/pdf")
+        response.headers["Content-Disposition"] = "attachment; filename=etiketten.pdf"
+        return response
+
+    @app.route("/barcodes/sheet.pdf", methods=["POST"])
+    def barcode_sheet_job():
+        job = enqueue_job("label_sheet", request.args.to_dict())
+        db.session.commit()
+        return job_accepted_response(job)
+
+    @app.route("/jobs/<int:id>")
+    def job_status(id: int):
+        job = db.session.get(Job, id)
+        if job is None:
+            return jsonify({"error": "Auftrag nicht gefunden."}), 404
+        return jsonify(job_status_payload(job))
+
+    @app.route("/jobs/<int:id>/download")
+    def job_download(id: int):
+        job = db.session.get(Job, id)
+        result = json.loads(job.result) if job is not None and job.result else {}
+        if job is None or job.status != "done" or not result.get("file"):
+            abort(404)
+        path = job_output_path(job.id, result["file"])
+        if not path.exists():
+            abort(404)
+        return send_file(path, mimetype=result.get("mimetype"), as_attachment=True, download_name=result["file"])
+
     @app.route("/duplicates")
     @app.route("/dubletten")
     def duplicates():
@@ -654,57 +2832,154 @@ def create_app() -> Flask:
             duplicate_article_count=sum(group["count"] for group in duplicate_groups),
         )
 
-    @app.route("/export.csv")
-    def export_csv():
-        sep = (request.args.get("sep", "semicolon") or "semicolon").lower()
-        delimiter = ";" if sep in ("semicolon", ";", "sc") else ","
-
-        encoding = (request.args.get("encoding", "utf-8") or "utf-8").lower()
-        add_bom = (request.args.get("bom", "1") in ("1", "true", "yes")) if encoding.startswith("utf") else False
-
-        cols = [
-            ("id", lambda a: a.id),
-            ("name", lambda a: a.name or ""),
-            ("bestand", lambda a: a.bestand),
-            ("mindestbestand", lambda a: a.mindestbestand),
-            ("lagerplatz", lambda a: a.lagerplatz or ""),
-            ("bestelllink", lambda a: a.bestelllink or ""),
-            ("hinweis", lambda a: (a.hinweis or "").replace("\n", " ").strip()),
-            ("barcode_id", lambda a: a.barcode_id),
-            ("barcode_filename", lambda a: a.barcode_filename or ""),
-            (
-                "created_at",
-                lambda a: a.created_at.strftime("%Y-%m-%d %H:%M:%S") if a.created_at else "",
-            ),
-        ]
-
-        artikel = Artikel.query.order_by(Artikel.name.asc(), Artikel.id.asc()).all()
-
-        sio = StringIO()
-        writer = csv.writer(sio, delimiter=delimiter, quoting=csv.QUOTE_MINIMAL)
-        writer.writerow([c[0] for c in cols])
-        for item in artikel:
-            writer.writerow([fn(item) for _, fn in cols])
+    @app.route("/reorder")
+    @app.route("/nachbestellen")
+    def reorder():
+        group_by = request.args.get("group", "lieferant")
+        if group_by not in REORDER_GROUP_OPTIONS:
+            group_by = "lieferant"
+        items = query_reorder_items()
+        return render_template(
+            "reorder.html",
+            groups=build_reorder_groups(items, group_by),
+            group_by=group_by,
+            group_options=REORDER_GROUP_OPTIONS,
+            item_count=len(items),
+            critical_count=sum(1 for item in items if item["status"] == "kritisch"),
+        )
 
-        data = sio.getvalue()
-        if encoding == "cp1252":
-            payload = data.encode("cp1252", errors="replace")
-            content_type = "text/csv; charset=windows-1252"
-        else:
-            if add_bom:
-                data = "\ufeff" + data
-            payload = data.encode("utf-8")
-            content_type = "text/csv; charset=utf-8"
+    @app.route("/reorder.json")
+    def reorder_json():
+        group_by = request.args.get("group", "lieferant")
+        if group_by not in REORDER_GROUP_OPTIONS:
+            return jsonify({"error": "Unbekannte Gruppierung."}), 400
+        items = query_reorder_items()
+        return jsonify(
+            {
+                "generated_at": datetime.utcnow().isoformat(timespec="seconds"),
+                "group_by": group_by,
+                "count": len(items),
+                "groups": build_reorder_groups(items, group_by),
+            }
+        )
 
+    @app.route("/export.csv")
+    def export_csv():
+        delimiter, charset, content_type, add_bom = export_csv_options(request.args)
         headers = {
             "Content-Disposition": "attachment; filename=artikel_export.csv",
             "Content-Type": content_type,
             "Cache-Control": "no-store",
         }
-        return Response(payload, headers=headers)
+        return Response(stream_with_context(iter_export_csv(delimiter, charset, add_bom)), headers=headers)
+
+    @app.route("/export.csv", methods=["POST"])
+    def export_csv_job():
+        job = enqueue_job("export_csv", request.args.to_dict())
+        db.session.commit()
+        return job_accepted_response(job)
+
+    @app.route("/import.csv", methods=["POST"])
+    def import_csv():
+        delimiter = csv_delimiter(request.args.get("sep"))
+        encoding = csv_text_encoding(request.args.get("encoding"))
+        dry_run = request.args.get("dry_run", "0") in ("1", "true", "yes")
+
+        upload = request.files.get("file")
+        stream = upload.stream if upload else io.BufferedReader(request.stream)
+        lines = io.TextIOWrapper(stream, encoding=encoding, newline="")
+        try:
+            report = import_articles(lines, delimiter=delimiter, dry_run=dry_run)
+        except UnicodeDecodeError:
+            return jsonify({"error": "Die Datei ist nicht im gewählten Encoding gespeichert."}), 400
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        except IntegrityError:
+            return jsonify({"error": "Der Import verletzt eindeutige Barcode-IDs."}), 409
+        return jsonify(report)
+
+    @app.cli.command("import-csv")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--sep", default="semicolon", help="semicolon oder comma")
+    @click.option("--encoding", default="utf-8", help="utf-8 oder cp1252")
+    @click.option("--dry-run", is_flag=True, help="Nur prüfen, nichts speichern.")
+    def import_csv_command(path: str, sep: str, encoding: str, dry_run: bool) -> None:
+        with open(path, encoding=csv_text_encoding(encoding), newline="") as handle:
+            report = import_articles(handle, delimiter=csv_delimiter(sep), dry_run=dry_run)
+        click.echo(json.dumps(report, ensure_ascii=False, indent=2))
+
+    @app.cli.command("compact-movements")
+    @click.option(
+        "--days",
+        type=int,
+        default=lambda: current_app.config["MOVEMENT_RETENTION_DAYS"],
+        help="Bewegungen älter als so viele Tage zusammenfassen.",
+    )
+    def compact_movements_command(days: int) -> None:
+        compacted = compact_movements(datetime.utcnow() - timedelta(days=days))
+        click.echo(f"{compacted} Artikel zusammengefasst.")
+
+    @app.cli.command("reorder-digest")
+    @click.option(
+        "--output",
+        default=None,
+        help="Zieldatei oder - für stdout (Standard: REORDER_DIGEST_DIR/bestellliste-JJJJ-MM-TT.csv).",
+    )
+    def reorder_digest_command(output: str | None) -> None:
+        items = query_reorder_items()
+        if output == "-":
+            write_reorder_digest(click.get_text_stream("stdout"), items)
+            return
+
+        if output:
+            path = Path(output)
+        else:
+            path = Path(current_app.config["REORDER_DIGEST_DIR"]) / (current_tenant() or "") / f"bestellliste-{datetime.now():%Y-%m-%d}.csv"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8-sig", newline="") as handle:
+            write_reorder_digest(handle, items)
+        click.echo(f"{len(items)} Artikel nach {path} geschrieben.")
+
+    @app.cli.command("check-aggregates")
+    @click.option("--fix", is_flag=True, help="Abweichungen durch Neuberechnung korrigieren.")
+    def check_aggregates_command(fix: bool) -> None:
+        drift, group_mismatches = check_inventory_aggregates(fix=fix)
+        for field, (stored, actual) in drift.items():
+            click.echo(f"{field}: gespeichert {stored}, tatsächlich {actual}")
+        if group_mismatches:
+            click.echo(f"{group_mismatches} Namensgruppen weichen ab.")
+        if not drift and not group_mismatches:
+            click.echo("Kennzahlen sind konsistent.")
+        elif fix:
+            click.echo("Kennzahlen neu berechnet.")
+        else:
+            raise SystemExit(1)
+
+    @app.cli.command("worker")
+    @click.option("--threads", type=int, default=2, help="Anzahl paralleler Worker-Threads.")
+    @click.option("--burst", is_flag=True, help="Beenden, sobald keine Aufträge mehr anstehen.")
+    def worker_command(threads: int, burst: bool) -> None:
+        worker = JobWorker(app, threads)
+        signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+        worker.start(burst=burst)
+        click.echo(f"Worker gestartet ({threads} Threads).")
+        try:
+            worker.join()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            worker.shutdown()
+
+    @app.cli.command("upgrade-tenants")
+    def upgrade_tenants_command() -> None:
+        for tenant in upgrade_tenants():
+            click.echo(f"Mandant {tenant or 'Standard'} migriert.")
 
     with app.app_context():
-        bootstrap_database()
+        if app.config["METRICS_ENABLED"]:
+            install_metrics(app)
+        if app.config["AUTO_MIGRATE"] and multiprocessing.parent_process() is None:
+            upgrade_tenants()
 
     return app
 
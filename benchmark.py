@@ -0,0 +1,391 @@
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+BASE_DIR = Path(__file__).resolve().parent
+NAME_PARTS = ("Schraube", "Mutter", "Dichtung", "Kabel", "Filter", "Lager", "Ventil", "Schlauch")
+SIZE_PARTS = ("M4", "M6", "M8", "10 mm", "25 mm", "1/2 Zoll", "DN 40")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark der wichtigsten Routen mit synthetischen Artikeln.")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Kommagetrennte Artikelanzahlen.")
+    parser.add_argument("--requests", type=int, default=200, help="Anfragen pro Szenario.")
+    parser.add_argument(
+        "--database-url",
+        default=os.getenv("BENCHMARK_DATABASE_URL"),
+        help="Leere Datenbank für den Lauf (Standard: temporäre SQLite-Datei). Vorhandene Artikel werden gelöscht.",
+    )
+    parser.add_argument("--gunicorn-workers", type=int, default=0, help="Zusätzlich gegen gunicorn mit N Workern messen.")
+    parser.add_argument(
+        "--gunicorn-worker-classes",
+        default="gthread",
+        help="Kommagetrennte Worker-Klassen für den gunicorn-Lauf (z. B. sync,gthread).",
+    )
+    parser.add_argument(
+        "--gunicorn-threads",
+        default="4",
+        help="Kommagetrennte Thread-Anzahlen pro Worker (nur für gthread).",
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallele Clients für den gunicorn-Lauf.")
+    parser.add_argument("--scenarios", help="Nur diese Szenarien messen (kommagetrennt), z. B. scanner_lookup,scanner_adjust.")
+    parser.add_argument(
+        "--barcode-ids",
+        type=int,
+        default=0,
+        help="So viele Barcode-IDs über den Allocator erzeugen und auf Eindeutigkeit prüfen, z. B. 1000000 (Standard: aus).",
+    )
+    parser.add_argument("--output", help="JSON-Bericht in diese Datei schreiben.")
+    return parser.parse_args()
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies: list[float], elapsed: float) -> dict[str, float | int]:
+    return {
+        "requests": len(latencies),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p90_ms": round(percentile(latencies, 0.90) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def seed_articles(app_module, count: int) -> list[tuple[int, str]]:
+    db = app_module.db
+    Artikel = app_module.Artikel
+    rng = random.Random(count)
+    now = datetime.utcnow()
+
+    db.session.execute(app_module.Lagerbewegung.__table__.delete())
+    db.session.execute(app_module.ScannerBuchung.__table__.delete())
+    db.session.execute(Artikel.__table__.delete())
+    db.session.commit()
+
+    rows = []
+    for index in range(count):
+        if index and rng.random() < 0.02:
+            name = rows[rng.randrange(len(rows))]["name"].upper()
+        else:
+            name = f"{rng.choice(NAME_PARTS)} {rng.choice(SIZE_PARTS)} #{index}"
+        barcode_id = uuid.uuid4().hex[:12]
+        mindestbestand = rng.randint(0, 20)
+        rows.append(
+            {
+                "name": name,
+                "name_normalized": app_module.normalize_article_name(name),
+                "bestand": max(0, mindestbestand + rng.randint(-10, 40)),
+                "mindestbestand": mindestbestand,
+                "lagerplatz": f"Regal {rng.randint(1, 40)} Fach {rng.randint(1, 12)}",
+                "bestelllink": "",
+                "hinweis": "",
+                "barcode_id": barcode_id,
+                "barcode_filename": f"{barcode_id}.png",
+                "created_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 365)),
+            }
+        )
+        if len(rows) >= 5000:
+            db.session.execute(app_module.insert(Artikel), rows)
+            rows = []
+    if rows:
+        db.session.execute(app_module.insert(Artikel), rows)
+    db.session.commit()
+    return [tuple(row) for row in db.session.execute(app_module.select(Artikel.id, Artikel.barcode_id)).all()]
+
+
+def build_scenarios(articles: list[tuple[int, str]], rng: random.Random) -> dict[str, callable]:
+    def pick() -> tuple[int, str]:
+        return articles[rng.randrange(len(articles))]
+
+    return {
+        "index": lambda: ("GET", "/", None),
+        "index_kritisch": lambda: ("GET", "/?status=kritisch", None),
+        "index_search": lambda: ("GET", "/?q=dichtung", None),
+        "barcodes_recent": lambda: ("GET", "/barcodes", None),
+        "barcodes_name": lambda: ("GET", "/barcodes?preset=all&name=ventil%20dn", None),
+        "duplicates_check": lambda: ("GET", f"/edit/{pick()[0]}", None),
+        "scanner_lookup": lambda: ("POST", "/scanner/lookup", {"code": pick()[1]}),
+        "scanner_adjust": lambda: (
+            "POST",
+            "/scanner/adjust",
+            {"article_id": pick()[0], "action": rng.choice(("add", "remove")), "amount": 1},
+        ),
+        "qr_image": lambda: ("GET", f"/qr/{pick()[1]}.png", None),
+    }
+
+
+def run_test_client(app_module, scenarios: dict, requests_per_scenario: int) -> dict[str, dict]:
+    client = app_module.app.test_client()
+    results = {}
+    for name, build in scenarios.items():
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(requests_per_scenario):
+            method, url, payload = build()
+            request_started = time.perf_counter()
+            response = client.open(url, method=method, json=payload)
+            response.get_data()
+            latencies.append(time.perf_counter() - request_started)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{name}: {url} lieferte {response.status_code}")
+        results[name] = summarize(latencies, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    response = client.get("/export.csv")
+    size = len(response.get_data())
+    results["export_csv"] = {**summarize([time.perf_counter() - started], time.perf_counter() - started), "bytes": size}
+    return results
+
+
+def run_normalizer_benchmark(app_module, iterations: int = 20000) -> dict[str, dict]:
+    normalize = app_module.normalize_scanned_barcode_id
+    samples = {
+        "bare": "{:08x}",
+        "url": "https://lager.example/adjust_barcode/{:08X}.png",
+        "query": "https://lager.example/scanner?barcode={:08x}",
+    }
+    results = {}
+    for name, template in samples.items():
+        app_module.parse_scanned_barcode_id.cache_clear()
+        started = time.perf_counter()
+        for index in range(iterations):
+            normalize(template.format(index))
+        cold = time.perf_counter() - started
+
+        repeated = template.format(0)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            normalize(repeated)
+        warm = time.perf_counter() - started
+        results[name] = {
+            "cold_us": round(cold / iterations * 1_000_000, 3),
+            "warm_us": round(warm / iterations * 1_000_000, 3),
+        }
+    return results
+
+
+def render_legacy_qr(app_module, barcode_id: str) -> bytes:
+    qr = app_module.qrcode.QRCode(
+        version=2,
+        error_correction=app_module.qrcode.constants.ERROR_CORRECT_M,
+        box_size=6,
+        border=2,
+    )
+    qr.add_data(barcode_id)
+    qr.make(fit=True)
+    buffer = io.BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def run_qr_benchmark(app_module, count: int = 500) -> dict[str, dict]:
+    barcode_ids = [app_module.encode_barcode_id(value) for value in range(count)]
+    variants = {"legacy_rgb_png": lambda barcode_id: render_legacy_qr(app_module, barcode_id)}
+    for fmt in ("png", "svg"):
+        for size in app_module.QR_SIZE_PRESETS:
+            def render(barcode_id: str, fmt: str = fmt, size: str = size) -> bytes:
+                modules, matrix = app_module.qr_matrix(barcode_id)
+                renderer = app_module.render_qr_svg if fmt == "svg" else app_module.render_qr_png
+                return renderer(modules, matrix, app_module.QR_SIZE_PRESETS[size])
+
+            variants[f"{fmt}_{size}"] = render
+
+    results = {}
+    for name, render in variants.items():
+        app_module.qr_matrix.cache_clear()
+        sizes = []
+        started = time.perf_counter()
+        for barcode_id in barcode_ids:
+            sizes.append(len(render(barcode_id)))
+        elapsed = time.perf_counter() - started
+        results[name] = {
+            "ms_per_code": round(elapsed / count * 1000, 3),
+            "bytes_per_code": round(statistics.fmean(sizes), 1),
+        }
+    return results
+
+
+def run_barcode_allocator_benchmark(app_module, count: int, batch_size: int = 1000) -> dict[str, float | int]:
+    barcode_ids: list[str] = []
+    with app_module.app.app_context():
+        started = time.perf_counter()
+        while len(barcode_ids) < count:
+            barcode_ids.extend(app_module.generate_barcode_ids(min(batch_size, count - len(barcode_ids))))
+        elapsed = time.perf_counter() - started
+        app_module.db.session.rollback()
+
+    if len(set(barcode_ids)) != len(barcode_ids):
+        raise RuntimeError("Allocator hat doppelte Barcode-IDs erzeugt.")
+    if not all(app_module.barcode_checksum_ok(barcode_id) for barcode_id in barcode_ids):
+        raise RuntimeError("Allocator hat Barcode-IDs mit falscher Prüfziffer erzeugt.")
+    return {
+        "ids": len(barcode_ids),
+        "seconds": round(elapsed, 2),
+        "ids_per_second": round(len(barcode_ids) / elapsed) if elapsed else 0,
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def gunicorn_variants(args: argparse.Namespace) -> list[tuple[str, int]]:
+    variants = []
+    for worker_class in [value.strip() for value in args.gunicorn_worker_classes.split(",") if value.strip()]:
+        if worker_class == "sync":
+            variants.append((worker_class, 1))
+            continue
+        for threads in [int(value) for value in args.gunicorn_threads.split(",") if value.strip()]:
+            variants.append((worker_class, threads))
+    return variants
+
+
+def run_gunicorn(
+    database_url: str, scenarios: dict, args: argparse.Namespace, worker_class: str, threads: int
+) -> dict[str, dict]:
+    import requests
+
+    port = free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "SCANNER_ENABLED": "true",
+        "AUTO_MIGRATE": "false",
+        "WEB_CONCURRENCY": str(args.gunicorn_workers),
+        "GUNICORN_WORKER_CLASS": worker_class,
+        "GUNICORN_THREADS": str(threads),
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app:app", "-c", "gunicorn.conf.py", "-b", f"127.0.0.1:{port}"],
+        cwd=BASE_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(300):
+            try:
+                requests.get(f"{base_url}/healthz", timeout=5)
+                break
+            except requests.RequestException:
+                time.sleep(0.1)
+
+        results = {}
+        lock = threading.Lock()
+        for name, build in scenarios.items():
+            latencies: list[float] = []
+            per_client = max(1, args.requests // args.concurrency)
+
+            def client_loop() -> None:
+                session = requests.Session()
+                local = []
+                for _ in range(per_client):
+                    method, url, payload = build()
+                    request_started = time.perf_counter()
+                    session.request(method, base_url + url, json=payload, timeout=60).content
+                    local.append(time.perf_counter() - request_started)
+                with lock:
+                    latencies.extend(local)
+
+            threads = [threading.Thread(target=client_loop) for _ in range(args.concurrency)]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            results[name] = summarize(latencies, time.perf_counter() - started)
+        return results
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=BASE_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    args = parse_args()
+    database_url = args.database_url or f"sqlite:///{Path(tempfile.mkdtemp()) / 'benchmark.db'}"
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["SCANNER_ENABLED"] = "true"
+    sys.path.insert(0, str(BASE_DIR))
+    import app as app_module
+
+    with app_module.app.app_context():
+        backend = app_module.db.engine.url.get_backend_name()
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "database": backend,
+        "requests_per_scenario": args.requests,
+        "normalize_scanned_barcode_id": run_normalizer_benchmark(app_module),
+        "qr_render": run_qr_benchmark(app_module),
+        "results": {},
+    }
+    if args.barcode_ids:
+        report["barcode_allocator"] = run_barcode_allocator_benchmark(app_module, args.barcode_ids)
+    for size in [int(value) for value in args.sizes.split(",") if value.strip()]:
+        with app_module.app.app_context():
+            seed_started = time.perf_counter()
+            articles = seed_articles(app_module, size)
+            seed_seconds = round(time.perf_counter() - seed_started, 2)
+        scenarios = build_scenarios(articles, random.Random(size))
+        if args.scenarios:
+            selected = {value.strip() for value in args.scenarios.split(",")}
+            scenarios = {name: build for name, build in scenarios.items() if name in selected}
+        entry = {
+            "seed_seconds": seed_seconds,
+            "test_client": run_test_client(app_module, scenarios, args.requests),
+        }
+        if args.gunicorn_workers:
+            entry["gunicorn"] = {
+                f"{worker_class}-{args.gunicorn_workers}x{threads}": {
+                    "worker_class": worker_class,
+                    "workers": args.gunicorn_workers,
+                    "threads": threads,
+                    "concurrency": args.concurrency,
+                    "routes": run_gunicorn(database_url, scenarios, args, worker_class, threads),
+                }
+                for worker_class, threads in gunicorn_variants(args)
+            }
+        report["results"][str(size)] = entry
+        print(f"{size} Artikel fertig", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,18 +7,88 @@ INSTANCE_DIR = BASE_DIR / "instance"
 BARCODE_DIR = BASE_DIR / "static" / "barcodes"
 
 
-def normalize_database_url(raw_url: str | None) -> str:
-    database_url = raw_url or f"sqlite:///{INSTANCE_DIR / 'lager.db'}"
+def normalize_database_url(raw_url: str | None, fallback_name: str = "lager") -> str:
+    database_url = raw_url or f"sqlite:///{INSTANCE_DIR / f'{fallback_name}.db'}"
     if database_url.startswith("postgres://"):
         return database_url.replace("postgres://", "postgresql://", 1)
     return database_url
 
 
+def build_engine_options(database_url: str) -> dict:
+    if database_url in {"sqlite://", "sqlite:///:memory:"}:
+        return {}
+
+    options = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "2")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").strip().lower() in {"true", "1", "yes", "on"},
+    }
+    statement_timeout = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    if database_url.startswith("postgresql"):
+        options["connect_args"] = {
+            "connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT", "5")),
+            "options": f"-c statement_timeout={statement_timeout}",
+        }
+    elif database_url.startswith("sqlite") and statement_timeout:
+        options["connect_args"] = {"timeout": statement_timeout / 1000}
+    return options
+
+
+def load_tenants() -> dict[str, dict]:
+    tenants = {}
+    for key in [value.strip().lower() for value in os.getenv("TENANTS", "").split(",") if value.strip()]:
+        prefix = f"TENANT_{key.upper().replace('-', '_')}_"
+        tenants[key] = {
+            "HOSTS": [host.strip().lower() for host in os.getenv(prefix + "HOSTS", "").split(",") if host.strip()],
+            "COMPANY_NAME": os.getenv(prefix + "COMPANY_NAME", key),
+            "APP_TITLE": os.getenv(prefix + "APP_TITLE", "Lagerverwaltung"),
+            "SCANNER_ENABLED": os.getenv(prefix + "SCANNER_ENABLED", "").strip().lower() in {"true", "1", "yes", "on"},
+            "DATABASE_URL": normalize_database_url(os.getenv(prefix + "DATABASE_URL"), f"lager-{key}"),
+        }
+    return tenants
+
+
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "local-dev-secret-key")
     COMPANY_NAME = os.getenv("COMPANY_NAME", "Musterfirma")
     APP_TITLE = os.getenv("APP_TITLE", "Lagerverwaltung")
     SCANNER_ENABLED = os.getenv("SCANNER_ENABLED", "").strip().lower() in {"true", "1", "yes", "on"}
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+    MOVEMENT_RETENTION_DAYS = int(os.getenv("MOVEMENT_RETENTION_DAYS", "90"))
+    INDEX_PAGE_SIZE = int(os.getenv("INDEX_PAGE_SIZE", "100"))
+    SCANNER_CACHE_SIZE = int(os.getenv("SCANNER_CACHE_SIZE", "1024"))
+    SCANNER_CACHE_TTL = int(os.getenv("SCANNER_CACHE_TTL", "30"))
+    SCANNER_STAMP_PATH = os.getenv("SCANNER_STAMP_PATH", str(INSTANCE_DIR / "scanner-stamps.db"))
+    SCANNER_BATCH_LIMIT = int(os.getenv("SCANNER_BATCH_LIMIT", "500"))
+    PREVENT_NEGATIVE_STOCK = os.getenv("PREVENT_NEGATIVE_STOCK", "").strip().lower() in {"true", "1", "yes", "on"}
+    AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "true").strip().lower() in {"true", "1", "yes", "on"}
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "").strip().lower() in {"true", "1", "yes", "on"}
+    REORDER_DIGEST_DIR = os.getenv("REORDER_DIGEST_DIR", str(INSTANCE_DIR / "digests"))
     SQLALCHEMY_DATABASE_URI = normalize_database_url(os.getenv("DATABASE_URL"))
+    SQLALCHEMY_ENGINE_OPTIONS = build_engine_options(SQLALCHEMY_DATABASE_URI)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    TENANTS = load_tenants()
+    TENANT = os.getenv("TENANT", "").strip().lower() or None
+    SQLALCHEMY_BINDS = {
+        key: {"url": tenant["DATABASE_URL"], **build_engine_options(tenant["DATABASE_URL"])}
+        for key, tenant in TENANTS.items()
+    }
     UPLOAD_FOLDER = str(BARCODE_DIR)
+    QR_CACHE_SIZE = int(os.getenv("QR_CACHE_SIZE", "2048"))
+    QR_CACHE_MAX_AGE = int(os.getenv("QR_CACHE_MAX_AGE", str(60 * 60 * 24 * 365)))
+    LABEL_SHEET_WORKERS = int(os.getenv("LABEL_SHEET_WORKERS", str(min(os.cpu_count() or 1, 2))))
+    LABEL_POOL_IDLE_TIMEOUT = float(os.getenv("LABEL_POOL_IDLE_TIMEOUT", "60"))
+    BARCODE_BLOCK_SIZE = int(os.getenv("BARCODE_BLOCK_SIZE", "100"))
+    JOB_WORKER_THREADS = int(os.getenv("JOB_WORKER_THREADS", "2"))
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+    JOB_HEARTBEAT_INTERVAL = float(os.getenv("JOB_HEARTBEAT_INTERVAL", "30"))
+    JOB_TIMEOUT = int(os.getenv("JOB_TIMEOUT", "120"))
+    JOB_SHUTDOWN_TIMEOUT = float(os.getenv("JOB_SHUTDOWN_TIMEOUT", "20"))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", "7"))
+    JOB_MAINTENANCE_INTERVAL = int(os.getenv("JOB_MAINTENANCE_INTERVAL", "60"))
+    JOB_OUTPUT_DIR = os.getenv("JOB_OUTPUT_DIR", str(INSTANCE_DIR / "jobs"))
+    LABEL_SHEET_LIMIT = int(os.getenv("LABEL_SHEET_LIMIT", "5000"))
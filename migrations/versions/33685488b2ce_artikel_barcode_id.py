@@ -0,0 +1,92 @@
+"""artikel barcode id
+
+Revision ID: 33685488b2ce
+Revises: 80a51007b13a
+Create Date: 2026-10-18 15:14:04
+
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '33685488b2ce'
+down_revision = '80a51007b13a'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def reassign_duplicate_barcode_ids(connection):
+    artikel = sa.table("artikel", sa.column("id", sa.Integer), sa.column("barcode_id", sa.String(length=100)))
+    duplicates = (
+        sa.select(artikel.c.barcode_id)
+        .group_by(artikel.c.barcode_id)
+        .having(sa.func.count() > 1)
+        .scalar_subquery()
+    )
+    rows = connection.execute(
+        sa.select(artikel.c.id, artikel.c.barcode_id)
+        .where(artikel.c.barcode_id.in_(duplicates))
+        .order_by(artikel.c.barcode_id, artikel.c.id)
+    ).all()
+    if not rows:
+        return
+
+    taken = set(connection.scalars(sa.select(artikel.c.barcode_id)))
+    kept = set()
+    for article_id, barcode_id in rows:
+        if barcode_id not in kept:
+            kept.add(barcode_id)
+            continue
+        suffix, attempt = f"-{article_id}", 1
+        new_barcode_id = barcode_id[: 100 - len(suffix)] + suffix
+        while new_barcode_id in taken:
+            suffix, attempt = f"-{article_id}-{attempt}", attempt + 1
+            new_barcode_id = barcode_id[: 100 - len(suffix)] + suffix
+        taken.add(new_barcode_id)
+        connection.execute(
+            sa.update(artikel).where(artikel.c.id == article_id).values(barcode_id=new_barcode_id)
+        )
+        logger.warning(
+            "Doppelte Barcode-ID %r: Artikel %s erhält %r (Artikel mit der kleinsten ID behält die ursprüngliche).",
+            barcode_id,
+            article_id,
+            new_barcode_id,
+        )
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"]: column for column in inspector.get_columns("artikel")}
+    indexes = {index["name"] for index in inspector.get_indexes("artikel")}
+
+    if "barcode_id" not in columns:
+        op.add_column("artikel", sa.Column("barcode_id", sa.String(length=100), nullable=True))
+    op.execute(
+        """
+        UPDATE artikel
+        SET barcode_id = CASE
+            WHEN barcode_filename LIKE '%.png'
+                THEN substr(barcode_filename, 1, length(barcode_filename) - 4)
+            ELSE barcode_filename
+        END
+        WHERE barcode_id IS NULL
+        """
+    )
+    if "ix_artikel_barcode_id" not in indexes:
+        reassign_duplicate_barcode_ids(op.get_bind())
+    if "barcode_id" not in columns or columns["barcode_id"]["nullable"]:
+        with op.batch_alter_table("artikel") as batch_op:
+            batch_op.alter_column("barcode_id", existing_type=sa.String(length=100), nullable=False)
+    if "ix_artikel_barcode_id" not in indexes:
+        op.create_index("ix_artikel_barcode_id", "artikel", ["barcode_id"], unique=True)
+
+
+def downgrade():
+    op.drop_index("ix_artikel_barcode_id", table_name="artikel")
+    with op.batch_alter_table("artikel") as batch_op:
+        batch_op.drop_column("barcode_id")
@@ -0,0 +1,41 @@
+"""job queue
+
+Revision ID: 3d6ff5ae359e
+Revises: 6e8b520f9fe9
+Create Date: 2026-10-18 15:37:50
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d6ff5ae359e'
+down_revision = '6e8b520f9fe9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("job"):
+        op.create_table(
+            "job",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("kind", sa.String(length=50), nullable=False),
+            sa.Column("payload", sa.Text(), nullable=False),
+            sa.Column("status", sa.String(length=20), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("result", sa.Text(), nullable=True),
+            sa.Column("error", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("started_at", sa.DateTime(), nullable=True),
+            sa.Column("finished_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_job_status_id", "job", ["status", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_job_status_id", table_name="job")
+    op.drop_table("job")
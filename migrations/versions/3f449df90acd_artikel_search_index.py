@@ -0,0 +1,76 @@
+"""artikel search index
+
+Revision ID: 3f449df90acd
+Revises: 95421b9e0e8c
+Create Date: 2026-10-18 15:20:15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f449df90acd'
+down_revision = '95421b9e0e8c'
+branch_labels = None
+depends_on = None
+
+SEARCH_TEXT_SQL = "lower(name || ' ' || coalesce(lagerplatz, '') || ' ' || barcode_id)"
+
+
+def sqlite_supports_trigram(bind):
+    version = bind.exec_driver_sql("SELECT sqlite_version()").scalar()
+    return tuple(int(part) for part in version.split(".")[:3]) >= (3, 34, 0)
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_artikel_search_trgm ON artikel USING gin (({SEARCH_TEXT_SQL}) gin_trgm_ops)"
+        )
+    elif bind.dialect.name == "sqlite" and sqlite_supports_trigram(bind):
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS artikel_search USING fts5("
+            "name, lagerplatz, barcode_id, content='artikel', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS artikel_search_insert AFTER INSERT ON artikel BEGIN
+                INSERT INTO artikel_search (rowid, name, lagerplatz, barcode_id)
+                VALUES (new.id, new.name, new.lagerplatz, new.barcode_id);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS artikel_search_delete AFTER DELETE ON artikel BEGIN
+                INSERT INTO artikel_search (artikel_search, rowid, name, lagerplatz, barcode_id)
+                VALUES ('delete', old.id, old.name, old.lagerplatz, old.barcode_id);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS artikel_search_update AFTER UPDATE OF name, lagerplatz, barcode_id ON artikel
+            BEGIN
+                INSERT INTO artikel_search (artikel_search, rowid, name, lagerplatz, barcode_id)
+                VALUES ('delete', old.id, old.name, old.lagerplatz, old.barcode_id);
+                INSERT INTO artikel_search (rowid, name, lagerplatz, barcode_id)
+                VALUES (new.id, new.name, new.lagerplatz, new.barcode_id);
+            END
+            """
+        )
+        op.execute("INSERT INTO artikel_search (artikel_search) VALUES ('rebuild')")
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_artikel_search_trgm")
+    elif bind.dialect.name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS artikel_search_update")
+        op.execute("DROP TRIGGER IF EXISTS artikel_search_delete")
+        op.execute("DROP TRIGGER IF EXISTS artikel_search_insert")
+        op.execute("DROP TABLE IF EXISTS artikel_search")
@@ -0,0 +1,27 @@
+"""job heartbeat
+
+Revision ID: 5a82a54de79b
+Revises: 3d6ff5ae359e
+Create Date: 2026-10-18 15:52:54
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a82a54de79b'
+down_revision = '3d6ff5ae359e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("job")}
+    if "heartbeat_at" not in columns:
+        op.add_column("job", sa.Column("heartbeat_at", sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("job") as batch_op:
+        batch_op.drop_column("heartbeat_at")
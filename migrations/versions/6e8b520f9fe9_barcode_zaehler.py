@@ -0,0 +1,38 @@
+"""barcode zaehler
+
+Revision ID: 6e8b520f9fe9
+Revises: de98e6e42ee0
+Create Date: 2026-10-18 15:33:09
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e8b520f9fe9'
+down_revision = 'de98e6e42ee0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("barcode_zaehler"):
+        op.create_table(
+            "barcode_zaehler",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("next_value", sa.BigInteger(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    op.execute(
+        """
+        INSERT INTO barcode_zaehler (id, next_value)
+        SELECT 1, 0
+        WHERE NOT EXISTS (SELECT 1 FROM barcode_zaehler WHERE id = 1)
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("barcode_zaehler")
@@ -0,0 +1,50 @@
+"""artikel baseline
+
+Revision ID: 80a51007b13a
+Revises: 
+Create Date: 2026-10-18 15:14:03
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '80a51007b13a'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("artikel"):
+        op.create_table(
+            "artikel",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(length=100), nullable=False),
+            sa.Column("bestand", sa.Integer(), nullable=False),
+            sa.Column("mindestbestand", sa.Integer(), nullable=False),
+            sa.Column("barcode_filename", sa.String(length=100), nullable=False),
+            sa.Column("lagerplatz", sa.String(length=100), nullable=True),
+            sa.Column("bestelllink", sa.String(length=300), nullable=True),
+            sa.Column("hinweis", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        return
+
+    columns = {column["name"] for column in inspector.get_columns("artikel")}
+    for column in (
+        sa.Column("lagerplatz", sa.String(length=100), nullable=True),
+        sa.Column("bestelllink", sa.String(length=300), nullable=True),
+        sa.Column("hinweis", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    ):
+        if column.name not in columns:
+            op.add_column("artikel", column)
+    op.execute("UPDATE artikel SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+
+
+def downgrade():
+    op.drop_table("artikel")
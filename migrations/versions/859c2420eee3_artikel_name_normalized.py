@@ -0,0 +1,54 @@
+"""artikel name normalized
+
+Revision ID: 859c2420eee3
+Revises: 33685488b2ce
+Create Date: 2026-10-18 15:14:06
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '859c2420eee3'
+down_revision = '33685488b2ce'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def normalize_name(value):
+    return " ".join((value or "").split()).lower()
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {column["name"]: column for column in inspector.get_columns("artikel")}
+    indexes = {index["name"] for index in inspector.get_indexes("artikel")}
+
+    if "name_normalized" not in columns:
+        op.add_column("artikel", sa.Column("name_normalized", sa.String(length=100), nullable=True))
+    while True:
+        rows = bind.execute(
+            sa.text("SELECT id, name FROM artikel WHERE name_normalized IS NULL LIMIT :limit"),
+            {"limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        bind.execute(
+            sa.text("UPDATE artikel SET name_normalized = :normalized WHERE id = :id"),
+            [{"id": row.id, "normalized": normalize_name(row.name)} for row in rows],
+        )
+    if "name_normalized" not in columns or columns["name_normalized"]["nullable"]:
+        with op.batch_alter_table("artikel") as batch_op:
+            batch_op.alter_column("name_normalized", existing_type=sa.String(length=100), nullable=False)
+    if "ix_artikel_name_normalized" not in indexes:
+        op.create_index("ix_artikel_name_normalized", "artikel", ["name_normalized"])
+
+
+def downgrade():
+    op.drop_index("ix_artikel_name_normalized", table_name="artikel")
+    with op.batch_alter_table("artikel") as batch_op:
+        batch_op.drop_column("name_normalized")
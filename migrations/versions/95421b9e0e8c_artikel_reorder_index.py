@@ -0,0 +1,30 @@
+"""artikel reorder index
+
+Revision ID: 95421b9e0e8c
+Revises: d6dc80ab8a6b
+Create Date: 2026-10-18 15:18:10
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '95421b9e0e8c'
+down_revision = 'd6dc80ab8a6b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_artikel_reorder",
+        "artikel",
+        ["lagerplatz", "name"],
+        postgresql_where=sa.text("bestand <= mindestbestand"),
+        sqlite_where=sa.text("bestand <= mindestbestand"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_artikel_reorder", table_name="artikel")
@@ -0,0 +1,71 @@
+"""artikel change tracking
+
+Revision ID: a8c5849f58d3
+Revises: 3f449df90acd
+Create Date: 2026-10-18 15:26:12
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8c5849f58d3'
+down_revision = '3f449df90acd'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {column["name"] for column in inspector.get_columns("artikel")}
+    indexes = {index["name"] for index in inspector.get_indexes("artikel")}
+
+    if "updated_at" not in columns:
+        op.add_column(
+            "artikel",
+            sa.Column("updated_at", sa.DateTime(), nullable=False, server_default="1970-01-01 00:00:00"),
+        )
+        op.execute("UPDATE artikel SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)")
+    if "version" not in columns:
+        op.add_column("artikel", sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"))
+    if "ix_artikel_version" not in indexes:
+        op.create_index("ix_artikel_version", "artikel", ["version", "id"])
+
+    if not inspector.has_table("artikel_loeschung"):
+        op.create_table(
+            "artikel_loeschung",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("artikel_id", sa.Integer(), nullable=False),
+            sa.Column("barcode_id", sa.String(length=100), nullable=False),
+            sa.Column("version", sa.BigInteger(), nullable=False),
+            sa.Column("deleted_at", sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_artikel_loeschung_version", "artikel_loeschung", ["version", "artikel_id"])
+
+    if not inspector.has_table("versionszaehler"):
+        op.create_table(
+            "versionszaehler",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("version", sa.BigInteger(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    op.execute(
+        """
+        INSERT INTO versionszaehler (id, version)
+        SELECT 1, 0
+        WHERE NOT EXISTS (SELECT 1 FROM versionszaehler WHERE id = 1)
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("versionszaehler")
+    op.drop_index("ix_artikel_loeschung_version", table_name="artikel_loeschung")
+    op.drop_table("artikel_loeschung")
+    op.drop_index("ix_artikel_version", table_name="artikel")
+    with op.batch_alter_table("artikel") as batch_op:
+        batch_op.drop_column("version")
+        batch_op.drop_column("updated_at")
@@ -0,0 +1,53 @@
+"""lagerbewegung ledger
+
+Revision ID: bfe675188178
+Revises: 859c2420eee3
+Create Date: 2026-10-18 15:14:07
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'bfe675188178'
+down_revision = '859c2420eee3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("lagerbewegung"):
+        op.create_table(
+            "lagerbewegung",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("artikel_id", sa.Integer(), nullable=False),
+            sa.Column("delta", sa.Integer(), nullable=False),
+            sa.Column("bestand", sa.Integer(), nullable=False),
+            sa.Column("action", sa.String(length=20), nullable=False),
+            sa.Column("source", sa.String(length=50), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    indexes = {index["name"] for index in inspector.get_indexes("lagerbewegung")}
+    if "ix_lagerbewegung_created_at" not in indexes:
+        op.create_index("ix_lagerbewegung_created_at", "lagerbewegung", ["created_at"])
+    if "ix_lagerbewegung_artikel_created" not in indexes:
+        op.create_index("ix_lagerbewegung_artikel_created", "lagerbewegung", ["artikel_id", "created_at"])
+
+    op.execute(
+        """
+        INSERT INTO lagerbewegung (artikel_id, delta, bestand, action, source, created_at)
+        SELECT id, bestand, bestand, 'snapshot', 'migration', CURRENT_TIMESTAMP
+        FROM artikel
+        WHERE bestand != 0
+        AND NOT EXISTS (SELECT 1 FROM lagerbewegung WHERE lagerbewegung.artikel_id = artikel.id)
+        """
+    )
+
+
+def downgrade():
+    op.drop_index("ix_lagerbewegung_artikel_created", table_name="lagerbewegung")
+    op.drop_index("ix_lagerbewegung_created_at", table_name="lagerbewegung")
+    op.drop_table("lagerbewegung")
@@ -0,0 +1,39 @@
+"""scanner buchung
+
+Revision ID: d6dc80ab8a6b
+Revises: bfe675188178
+Create Date: 2026-10-18 15:14:08
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd6dc80ab8a6b'
+down_revision = 'bfe675188178'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("scanner_buchung"):
+        op.create_table(
+            "scanner_buchung",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("client_uuid", sa.String(length=64), nullable=False),
+            sa.Column("artikel_id", sa.Integer(), nullable=False),
+            sa.Column("action", sa.String(length=20), nullable=False),
+            sa.Column("amount", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    indexes = {index["name"] for index in inspector.get_indexes("scanner_buchung")}
+    if "ix_scanner_buchung_client_uuid" not in indexes:
+        op.create_index("ix_scanner_buchung_client_uuid", "scanner_buchung", ["client_uuid"], unique=True)
+
+
+def downgrade():
+    op.drop_index("ix_scanner_buchung_client_uuid", table_name="scanner_buchung")
+    op.drop_table("scanner_buchung")
@@ -0,0 +1,215 @@
+"""artikel kennzahlen
+
+Revision ID: de98e6e42ee0
+Revises: a8c5849f58d3
+Create Date: 2026-10-18 15:30:18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'de98e6e42ee0'
+down_revision = 'a8c5849f58d3'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_STATUS_CHANGED = (
+    "(old.bestand < old.mindestbestand) != (new.bestand < new.mindestbestand) "
+    "OR (old.bestand = old.mindestbestand) != (new.bestand = new.mindestbestand)"
+)
+
+
+def sqlite_name_added(row):
+    group = f"FROM artikel_namensgruppe WHERE name_normalized = {row}.name_normalized"
+    return f"""
+        INSERT INTO artikel_namensgruppe (name_normalized, anzahl) VALUES ({row}.name_normalized, 1)
+        ON CONFLICT (name_normalized) DO UPDATE SET anzahl = anzahl + 1;
+        UPDATE artikel_kennzahl SET
+            duplicate_groups = duplicate_groups + COALESCE((SELECT anzahl = 2 {group}), 0),
+            duplicate_articles = duplicate_articles
+                + COALESCE((SELECT CASE WHEN anzahl = 2 THEN 2 WHEN anzahl > 2 THEN 1 ELSE 0 END {group}), 0)
+        WHERE id = 1 AND {row}.name_normalized != '';
+    """
+
+
+def sqlite_name_removed(row):
+    group = f"FROM artikel_namensgruppe WHERE name_normalized = {row}.name_normalized"
+    return f"""
+        UPDATE artikel_namensgruppe SET anzahl = anzahl - 1 WHERE name_normalized = {row}.name_normalized;
+        UPDATE artikel_kennzahl SET
+            duplicate_groups = duplicate_groups - COALESCE((SELECT anzahl = 1 {group}), 0),
+            duplicate_articles = duplicate_articles
+                - COALESCE((SELECT CASE WHEN anzahl = 1 THEN 2 WHEN anzahl > 1 THEN 1 ELSE 0 END {group}), 0)
+        WHERE id = 1 AND {row}.name_normalized != '';
+        DELETE FROM artikel_namensgruppe WHERE name_normalized = {row}.name_normalized AND anzahl <= 0;
+    """
+
+
+POSTGRESQL_FUNCTION = """
+CREATE OR REPLACE FUNCTION artikel_kennzahl_trigger() RETURNS trigger AS $$
+DECLARE
+    delta_total integer := 0;
+    delta_critical integer := 0;
+    delta_low integer := 0;
+    delta_groups integer := 0;
+    delta_articles integer := 0;
+    group_size integer;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        delta_total := delta_total - 1;
+        delta_critical := delta_critical - (OLD.bestand < OLD.mindestbestand)::integer;
+        delta_low := delta_low - (OLD.bestand = OLD.mindestbestand)::integer;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        delta_total := delta_total + 1;
+        delta_critical := delta_critical + (NEW.bestand < NEW.mindestbestand)::integer;
+        delta_low := delta_low + (NEW.bestand = NEW.mindestbestand)::integer;
+    END IF;
+
+    IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.name_normalized IS DISTINCT FROM NEW.name_normalized) THEN
+        UPDATE artikel_namensgruppe SET anzahl = anzahl - 1
+        WHERE name_normalized = OLD.name_normalized
+        RETURNING anzahl INTO group_size;
+        IF OLD.name_normalized <> '' AND group_size >= 1 THEN
+            delta_groups := delta_groups - (group_size = 1)::integer;
+            delta_articles := delta_articles - CASE WHEN group_size = 1 THEN 2 ELSE 1 END;
+        END IF;
+        DELETE FROM artikel_namensgruppe WHERE name_normalized = OLD.name_normalized AND anzahl <= 0;
+    END IF;
+    IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND OLD.name_normalized IS DISTINCT FROM NEW.name_normalized) THEN
+        INSERT INTO artikel_namensgruppe (name_normalized, anzahl) VALUES (NEW.name_normalized, 1)
+        ON CONFLICT (name_normalized) DO UPDATE SET anzahl = artikel_namensgruppe.anzahl + 1
+        RETURNING anzahl INTO group_size;
+        IF NEW.name_normalized <> '' AND group_size >= 2 THEN
+            delta_groups := delta_groups + (group_size = 2)::integer;
+            delta_articles := delta_articles + CASE WHEN group_size = 2 THEN 2 ELSE 1 END;
+        END IF;
+    END IF;
+
+    IF delta_total <> 0 OR delta_critical <> 0 OR delta_low <> 0 OR delta_groups <> 0 OR delta_articles <> 0 THEN
+        UPDATE artikel_kennzahl SET
+            total = total + delta_total,
+            critical = critical + delta_critical,
+            low = low + delta_low,
+            duplicate_groups = duplicate_groups + delta_groups,
+            duplicate_articles = duplicate_articles + delta_articles
+        WHERE id = 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("artikel_kennzahl"):
+        op.create_table(
+            "artikel_kennzahl",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("total", sa.Integer(), nullable=False),
+            sa.Column("critical", sa.Integer(), nullable=False),
+            sa.Column("low", sa.Integer(), nullable=False),
+            sa.Column("duplicate_groups", sa.Integer(), nullable=False),
+            sa.Column("duplicate_articles", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    if not inspector.has_table("artikel_namensgruppe"):
+        op.create_table(
+            "artikel_namensgruppe",
+            sa.Column("name_normalized", sa.String(length=100), nullable=False),
+            sa.Column("anzahl", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("name_normalized"),
+        )
+
+    if bind.dialect.name == "postgresql":
+        op.execute("LOCK TABLE artikel IN SHARE MODE")
+        op.execute(POSTGRESQL_FUNCTION)
+        op.execute("DROP TRIGGER IF EXISTS artikel_kennzahl ON artikel")
+        op.execute(
+            "CREATE TRIGGER artikel_kennzahl AFTER INSERT OR DELETE OR UPDATE OF bestand, mindestbestand, name_normalized "
+            "ON artikel FOR EACH ROW EXECUTE FUNCTION artikel_kennzahl_trigger()"
+        )
+    elif bind.dialect.name == "sqlite":
+        op.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS artikel_kennzahl_insert AFTER INSERT ON artikel BEGIN
+                UPDATE artikel_kennzahl SET
+                    total = total + 1,
+                    critical = critical + (new.bestand < new.mindestbestand),
+                    low = low + (new.bestand = new.mindestbestand)
+                WHERE id = 1;
+                {sqlite_name_added("new")}
+            END
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS artikel_kennzahl_delete AFTER DELETE ON artikel BEGIN
+                UPDATE artikel_kennzahl SET
+                    total = total - 1,
+                    critical = critical - (old.bestand < old.mindestbestand),
+                    low = low - (old.bestand = old.mindestbestand)
+                WHERE id = 1;
+                {sqlite_name_removed("old")}
+            END
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS artikel_kennzahl_status AFTER UPDATE OF bestand, mindestbestand ON artikel
+            WHEN {SQLITE_STATUS_CHANGED}
+            BEGIN
+                UPDATE artikel_kennzahl SET
+                    critical = critical - (old.bestand < old.mindestbestand) + (new.bestand < new.mindestbestand),
+                    low = low - (old.bestand = old.mindestbestand) + (new.bestand = new.mindestbestand)
+                WHERE id = 1;
+            END
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS artikel_kennzahl_name AFTER UPDATE OF name_normalized ON artikel
+            WHEN old.name_normalized != new.name_normalized
+            BEGIN
+                {sqlite_name_removed("old")}
+                {sqlite_name_added("new")}
+            END
+            """
+        )
+
+    op.execute("DELETE FROM artikel_namensgruppe")
+    op.execute(
+        "INSERT INTO artikel_namensgruppe (name_normalized, anzahl) "
+        "SELECT name_normalized, COUNT(*) FROM artikel GROUP BY name_normalized"
+    )
+    op.execute("DELETE FROM artikel_kennzahl")
+    op.execute(
+        """
+        INSERT INTO artikel_kennzahl (id, total, critical, low, duplicate_groups, duplicate_articles)
+        SELECT 1,
+            (SELECT COUNT(*) FROM artikel),
+            (SELECT COUNT(*) FROM artikel WHERE bestand < mindestbestand),
+            (SELECT COUNT(*) FROM artikel WHERE bestand = mindestbestand),
+            (SELECT COUNT(*) FROM artikel_namensgruppe WHERE name_normalized != '' AND anzahl > 1),
+            (SELECT COALESCE(SUM(anzahl), 0) FROM artikel_namensgruppe WHERE name_normalized != '' AND anzahl > 1)
+        """
+    )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS artikel_kennzahl ON artikel")
+        op.execute("DROP FUNCTION IF EXISTS artikel_kennzahl_trigger()")
+    elif bind.dialect.name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS artikel_kennzahl_name")
+        op.execute("DROP TRIGGER IF EXISTS artikel_kennzahl_status")
+        op.execute("DROP TRIGGER IF EXISTS artikel_kennzahl_delete")
+        op.execute("DROP TRIGGER IF EXISTS artikel_kennzahl_insert")
+    op.drop_table("artikel_namensgruppe")
+    op.drop_table("artikel_kennzahl")
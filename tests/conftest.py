@@ -0,0 +1,43 @@
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+TEST_DIR = Path(tempfile.mkdtemp(prefix="lager-tests-"))
+
+for key in [key for key in os.environ if key.startswith("TENANT")]:
+    del os.environ[key]
+os.environ.update(
+    {
+        "DATABASE_URL": f"sqlite:///{TEST_DIR / 'lager.db'}",
+        "AUTO_MIGRATE": "true",
+        "JOB_WORKER_THREADS": "0",
+        "JOB_OUTPUT_DIR": str(TEST_DIR / "jobs"),
+        "SCANNER_STAMP_PATH": str(TEST_DIR / "scanner-stamps.db"),
+        "METRICS_ENABLED": "false",
+        "PREVENT_NEGATIVE_STOCK": "false",
+    }
+)
+
+from app import Artikel, app as flask_app, db, encode_barcode_id  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    with flask_app.app_context():
+        yield flask_app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def article(app):
+    barcode_id = encode_barcode_id(int.from_bytes(os.urandom(4), "big"))
+    artikel = Artikel(name="Testartikel", bestand=0, barcode_id=barcode_id, barcode_filename=f"{barcode_id}.png")
+    db.session.add(artikel)
+    db.session.commit()
+    return artikel.id
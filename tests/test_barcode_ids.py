@@ -0,0 +1,107 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import update
+
+from app import (
+    BARCODE_ALPHABET,
+    BARCODE_BODY_LENGTH,
+    BarcodeAllocator,
+    BarcodeZaehler,
+    barcode_check_char,
+    barcode_checksum_ok,
+    db,
+    encode_barcode_id,
+    normalize_scanned_barcode_id,
+    parse_scanned_barcode_id,
+)
+
+BLOCK_SIZES = [1, 7, 64, 1000]
+VALUES_PER_ALLOCATOR = 3000
+RANGE_START = 2**35 - 3000
+
+
+def sample_ids(count):
+    rng = random.Random(count)
+    values = [0, 1, 31, 32, 2**35 - 1, 2**35, len(BARCODE_ALPHABET) ** BARCODE_BODY_LENGTH - 1]
+    values += [rng.randrange(len(BARCODE_ALPHABET) ** BARCODE_BODY_LENGTH) for _ in range(count)]
+    return [encode_barcode_id(value) for value in values]
+
+
+def test_allocators_never_hand_out_a_value_twice(app):
+    db.session.execute(update(BarcodeZaehler).where(BarcodeZaehler.id == 1).values(next_value=RANGE_START))
+    db.session.commit()
+    allocators = [BarcodeAllocator(block_size) for block_size in BLOCK_SIZES]
+    engine = db.engine
+
+    def drain(allocator):
+        rng = random.Random(allocator.block_size)
+        values = []
+        while len(values) < VALUES_PER_ALLOCATOR:
+            values.extend(allocator.allocate_from(engine, rng.randint(1, 2 * allocator.block_size)))
+        return values
+
+    with ThreadPoolExecutor(len(allocators)) as pool:
+        allocated = [value for values in pool.map(drain, allocators) for value in values]
+
+    assert len(allocated) == len(set(allocated))
+    assert min(allocated) >= RANGE_START
+    assert max(allocated) >= 2**35
+    barcode_ids = [encode_barcode_id(value) for value in allocated]
+    assert len(set(barcode_ids)) == len(barcode_ids)
+    assert all(barcode_checksum_ok(barcode_id) for barcode_id in barcode_ids)
+
+
+def test_encoding_is_unique_and_ordered_over_a_large_range():
+    start = 2**35 - 125_000
+    barcode_ids = [encode_barcode_id(value) for value in range(start, start + 250_000)]
+    assert len(set(barcode_ids)) == len(barcode_ids)
+    assert barcode_ids == sorted(barcode_ids)
+    assert all(barcode_checksum_ok(barcode_id) for barcode_id in barcode_ids)
+
+
+@pytest.mark.parametrize("value", [-1, len(BARCODE_ALPHABET) ** BARCODE_BODY_LENGTH])
+def test_encoding_rejects_values_outside_the_range(value):
+    with pytest.raises(ValueError):
+        encode_barcode_id(value)
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "{}",
+        "{upper}",
+        "{}.png",
+        "{upper}.PNG",
+        ' "{}" ',
+        "https://lager.example.ch/qr/{}.png",
+        "https://lager.example.ch/adjust_barcode/{upper}",
+        "?code={upper}",
+    ],
+)
+def test_scanned_ids_round_trip(template):
+    for barcode_id in sample_ids(200):
+        raw_code = template.format(barcode_id, upper=barcode_id.upper())
+        assert parse_scanned_barcode_id(raw_code) == barcode_id
+        assert normalize_scanned_barcode_id(raw_code) == barcode_id
+
+
+def test_check_char_rejects_every_single_substitution():
+    for barcode_id in sample_ids(500):
+        for position, original in enumerate(barcode_id):
+            for char in BARCODE_ALPHABET:
+                if char != original:
+                    assert not barcode_checksum_ok(barcode_id[:position] + char + barcode_id[position + 1 :])
+
+
+def test_check_char_rejects_every_adjacent_transposition():
+    bodies = [barcode_id[:-1] for barcode_id in sample_ids(200)]
+    bodies += [f"{left}{right}" * (BARCODE_BODY_LENGTH // 2) for left in BARCODE_ALPHABET for right in BARCODE_ALPHABET]
+    for body in bodies:
+        barcode_id = body + barcode_check_char(body)
+        for position in range(len(barcode_id) - 1):
+            left, right = barcode_id[position], barcode_id[position + 1]
+            if left != right:
+                swapped = barcode_id[:position] + right + left + barcode_id[position + 2 :]
+                assert not barcode_checksum_ok(swapped)
@@ -0,0 +1,67 @@
+import random
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func, select
+
+from app import Artikel, Lagerbewegung, db
+
+THREADS = 8
+BOOKINGS_PER_THREAD = 25
+
+
+def book_concurrently(app, article_id, bookings_for_thread):
+    barrier = threading.Barrier(THREADS)
+
+    def worker(bookings):
+        client = app.test_client()
+        barrier.wait()
+        return [
+            client.post(
+                f"/api/v1/artikel/{article_id}/buchungen",
+                json={"action": action, "amount": amount, "client_uuid": str(uuid.uuid4())},
+            ).status_code
+            for action, amount in bookings
+        ]
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        statuses = list(pool.map(worker, [bookings_for_thread(index) for index in range(THREADS)]))
+    return [status for thread_statuses in statuses for status in thread_statuses]
+
+
+def stock_and_ledger(article_id):
+    db.session.expire_all()
+    bestand = db.session.get(Artikel, article_id).bestand
+    ledger_sum, ledger_count = db.session.execute(
+        select(func.coalesce(func.sum(Lagerbewegung.delta), 0), func.count()).where(
+            Lagerbewegung.artikel_id == article_id
+        )
+    ).one()
+    return bestand, ledger_sum, ledger_count
+
+
+def test_parallel_bookings_are_not_lost(app, article):
+    def bookings(index):
+        return [("add", 3) if (index + step) % 2 else ("remove", 1) for step in range(BOOKINGS_PER_THREAD)]
+
+    statuses = book_concurrently(app, article, bookings)
+
+    expected = sum(3 if action == "add" else -1 for index in range(THREADS) for action, _ in bookings(index))
+    assert statuses == [200] * THREADS * BOOKINGS_PER_THREAD
+    assert stock_and_ledger(article) == (expected, expected, THREADS * BOOKINGS_PER_THREAD)
+
+
+def test_parallel_corrections_keep_ledger_consistent(app, article):
+    def bookings(index):
+        rng = random.Random(index)
+        return [
+            rng.choice([("add", rng.randint(1, 5)), ("remove", rng.randint(1, 5)), ("correct", rng.randint(0, 50))])
+            for _ in range(BOOKINGS_PER_THREAD)
+        ]
+
+    statuses = book_concurrently(app, article, bookings)
+
+    bestand, ledger_sum, _ = stock_and_ledger(article)
+    assert statuses == [200] * THREADS * BOOKINGS_PER_THREAD
+    assert ledger_sum == bestand
@@ -0,0 +1,32 @@
+import base64
+import json
+
+import pytest
+
+
+def encode(value):
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+CRAFTED_CURSORS = [
+    [{"a": 1}, 3],
+    ["x", {"b": 2}],
+    [[1], 2],
+    [True, 1],
+    [10**30, 1],
+    ["abc", 2**70],
+    "kein-array",
+]
+
+
+@pytest.mark.parametrize("value", CRAFTED_CURSORS)
+@pytest.mark.parametrize("path", ["/?after=", "/?sort=bestand&after=", "/?sort=neu_desc&after=", "/api/v1/artikel?after="])
+def test_index_ignores_crafted_cursor(client, path, value):
+    assert client.get(path + encode(value)).status_code == 200
+
+
+@pytest.mark.parametrize("value", [*CRAFTED_CURSORS, ["abc", 5]])
+def test_change_feed_rejects_crafted_cursor(client, value):
+    response = client.get("/changes?since=" + encode(value))
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Ungültiger Cursor."}
@@ -0,0 +1,16 @@
+import pytest
+
+from app import Artikel, barcode_image_cache, db
+
+
+def test_renders_qr_for_existing_article(client, article):
+    barcode_id = db.session.get(Artikel, article).barcode_id
+    assert client.get(f"/qr/{barcode_id}.png").mimetype == "image/png"
+    assert client.get(f"/qr/{barcode_id}.svg").mimetype == "image/svg+xml"
+
+
+@pytest.mark.parametrize("barcode_id", ["a" * 3000, "a" * 101, "unbekannt", "a%20b"])
+def test_rejects_unknown_or_malformed_ids_without_caching(client, barcode_id):
+    cached = len(barcode_image_cache)
+    assert client.get(f"/qr/{barcode_id}.png").status_code == 404
+    assert len(barcode_image_cache) == cached
@@ -0,0 +1,87 @@
+import re
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+from hypothesis import example, given
+from hypothesis import strategies as st
+
+from app import normalize_scanned_barcode_id
+
+
+def reference_normalize_scanned_barcode_id(raw_code):
+    value = re.sub(r"\s+", "", raw_code or "")
+    value = value.strip("\"'<>")
+    if not value:
+        return ""
+
+    parsed = urlparse(value)
+    path = unquote(parsed.path or "")
+    segments = [segment for segment in path.split("/") if segment]
+    if segments:
+        value = segments[-1]
+    elif parsed.query:
+        query_values = parse_qs(parsed.query)
+        for key in ("barcode", "barcode_id", "code", "id"):
+            if query_values.get(key):
+                value = query_values[key][0]
+                break
+
+    value = unquote(value).strip("\"'<>")
+    value = re.sub(r"\.png", "", value, flags=re.IGNORECASE)
+    return value.lower()
+
+
+barcode_ids = st.text(alphabet="0123456789abcdefghjkmnpqrstvwxyzABCXYZ_-.", min_size=1, max_size=16)
+suffixes = st.sampled_from(["", ".png", ".PNG", ".Png"])
+query_keys = st.sampled_from(["barcode", "barcode_id", "code", "id", "other"])
+wrappers = st.sampled_from(["", '"', "'", "<", ">", "<>"])
+whitespace = st.text(alphabet=" \t\r\n", max_size=3)
+
+
+@st.composite
+def scanned_urls(draw):
+    scheme = draw(st.sampled_from(["http://", "https://", ""]))
+    host = draw(st.sampled_from(["lager.example.ch", "localhost:5000", ""]))
+    prefix = draw(st.sampled_from(["/qr/", "/static/barcodes/", "/adjust_barcode/", "/"]))
+    barcode_id = quote(draw(barcode_ids) + draw(suffixes)) if draw(st.booleans()) else draw(barcode_ids)
+    return f"{scheme}{host}{prefix}{barcode_id}"
+
+
+@st.composite
+def scanned_queries(draw):
+    pairs = draw(st.lists(st.tuples(query_keys, barcode_ids), min_size=1, max_size=3))
+    base = draw(st.sampled_from(["", "?", "https://lager.example.ch/?", "/scanner?"]))
+    return base.rstrip("?") + "?" + "&".join(f"{key}={value}" for key, value in pairs)
+
+
+@st.composite
+def wrapped(draw, codes):
+    left, right = draw(wrappers), draw(wrappers)
+    code = draw(codes)
+    if draw(st.booleans()):
+        position = draw(st.integers(0, len(code)))
+        code = code[:position] + draw(whitespace) + code[position:]
+    return f"{draw(whitespace)}{left}{code}{right}{draw(whitespace)}"
+
+
+scanned_codes = st.one_of(
+    barcode_ids,
+    st.builds(str.__add__, barcode_ids, suffixes),
+    scanned_urls(),
+    scanned_queries(),
+)
+
+
+@given(st.one_of(scanned_codes, wrapped(scanned_codes)))
+@example("0A1B2C3D4")
+@example("0a1b2c3d4.PNG")
+@example("https://lager.example.ch/qr/0a1b2c3d4.png")
+@example("?code=abc&id=def")
+@example('  "ABC 123.PNG"  ')
+@example("")
+def test_matches_reference_for_scanner_input(raw_code):
+    assert normalize_scanned_barcode_id(raw_code) == reference_normalize_scanned_barcode_id(raw_code)
+
+
+@given(st.one_of(st.none(), st.text()))
+def test_matches_reference_for_arbitrary_text(raw_code):
+    assert normalize_scanned_barcode_id(raw_code) == reference_normalize_scanned_barcode_id(raw_code)
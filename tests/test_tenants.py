@@ -0,0 +1,46 @@
+import pytest
+
+from app import Config, create_app, db, metrics
+
+
+@pytest.fixture
+def tenant_client(monkeypatch, tmp_path):
+    url = f"sqlite:///{tmp_path / 'nord.db'}"
+    monkeypatch.setattr(
+        Config,
+        "TENANTS",
+        {
+            "nord": {
+                "HOSTS": ["nord.example.ch"],
+                "COMPANY_NAME": "Nord",
+                "APP_TITLE": "Lagerverwaltung",
+                "SCANNER_ENABLED": False,
+                "DATABASE_URL": url,
+            }
+        },
+    )
+    monkeypatch.setattr(Config, "SQLALCHEMY_BINDS", {"nord": {"url": url}})
+    monkeypatch.setattr(Config, "METRICS_ENABLED", True)
+    monkeypatch.setattr(Config, "AUTO_MIGRATE", False)
+    monkeypatch.setattr(metrics, "enabled", metrics.enabled)
+    tenant_app = create_app()
+    yield tenant_app.test_client()
+    tenant_app.extensions["job_worker"].shutdown()
+    with tenant_app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+@pytest.mark.parametrize("path", ["/healthz", "/metrics"])
+def test_operational_routes_answer_without_tenant(tenant_client, path):
+    assert tenant_client.get(path).status_code == 200
+
+
+def test_tenant_routes_need_a_tenant(tenant_client):
+    assert tenant_client.get("/").status_code == 404
+
+
+def test_metrics_are_reachable_per_tenant(tenant_client):
+    response = tenant_client.get("/nord/metrics")
+    assert response.status_code == 200
+    assert "lager_http_requests_total" in response.text